@@ -2,6 +2,7 @@ from flask import Flask, render_template, request, session, jsonify, redirect, R
 import sys
 import os
 import time
+import threading
 import traceback
 
 # Add utilities directory to path
@@ -44,6 +45,7 @@ app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=30)
 app.config['SESSION_COOKIE_SECURE'] = True  # Only send over HTTPS
 app.config['SESSION_COOKIE_HTTPONLY'] = True  # Prevent JS access
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'  # CSRF protection
+app.config['SESSION_REFRESH_EACH_REQUEST'] = False  # Read-only routes like /chat_response must not re-send (and roll back) the game cookie
 
 
 # Initialize async logging for production immediately when module loads
@@ -53,6 +55,7 @@ if IS_PRODUCTION:
 
 DEBUG_MODE = False
 session_tracker = {}
+session_tracker_lock = threading.Lock()  # /state runs on several gunicorn threads at once
 
 # Error notification system
 LAST_ERROR_EMAIL_TIME = {}  # Track when we last emailed about each error type
@@ -313,11 +316,11 @@ def get_state():
     client_ip = get_client_ip(request)
     game_phase = session.get('game', {}).get('phase', 'no-game')
     
-    session_tracker[client_ip] = {'last_seen': time.time(), 'phase': game_phase}
-    
     cutoff = time.time() - 300
-    active = {ip: data for ip, data in session_tracker.items() if data['last_seen'] > cutoff}
-    session_tracker = active
+    with session_tracker_lock:
+        session_tracker[client_ip] = {'last_seen': time.time(), 'phase': game_phase}
+        session_tracker = {ip: data for ip, data in session_tracker.items() if data['last_seen'] > cutoff}
+        active = session_tracker.copy()
     
     total_ips = len(active)
     print(f"ACTIVE: {total_ips} users | Current: {client_ip} ({game_phase})")
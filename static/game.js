@@ -81,6 +81,7 @@ function sendMessage() {
     showMartaTyping();
 
     // Get smart response from Marta with enhanced context - ONLY user-initiated
+    const sentAt = Date.now();
     fetch('/chat_response', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
@@ -89,8 +90,8 @@ function sendMessage() {
         .then(response => response.json())
         .then(data => {
             if (data.response) {
-                // Simulate realistic typing time based on response length
-                const typingDelay = Math.min(Math.max(data.response.length * 50, 800), 3000);
+                // Simulate realistic typing time based on response length, counting time already spent waiting on the server
+                const typingDelay = Math.max(Math.min(Math.max(data.response.length * 50, 800), 3000) - (Date.now() - sentAt), 0);
 
                 setTimeout(() => {
                     hideMartaTyping();
@@ -4,12 +4,23 @@ Contains all non-routing logic moved from app.py
 """
 from flask import session
 import time
-from .logging_utils import log_action, log_game_event, track_session_client, get_client_ip, IS_PRODUCTION
+import logging
+import socket
+import threading
+import asyncio
+import atexit
+import aiohttp
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+from .logging_utils import log_action, log_game_event, track_session_client, get_client_ip, queue_db_operation, get_logger, IS_PRODUCTION
+from .postgres_utils import get_db_connection, finalize_hand, save_ip_location_data, save_failed_ip_lookup
 from .custom_rules import (
     check_special_cards_in_trick, reduce_bags_safely, assign_even_odd_at_game_start,
     calculate_discard_score_with_winner, calculate_hand_scores_with_bags,
     get_player_names_with_parity, check_special_cards_in_discard,
-    check_blind_bidding_eligibility, get_display_score
+    check_blind_bidding_eligibility, get_display_score, WINNER_NAMES
 )
 from .gameplay_logic import determine_trick_winner, init_game, init_new_hand, check_game_over
 from .computer_logic import (
@@ -18,6 +29,19 @@ from .computer_logic import (
 )
 from .logging_utils import initialize_game_logging_with_client, finalize_game_logging, flush_hand_events
 
+logger = get_logger(__name__)
+
+_IP_API_URL = 'http://ip-api.com/json/%s'
+_GEO_HEADERS = {'User-Agent': 'TwoManSpades-GeoLookup/1.0'}
+_BLOCKED_WORDS_URL = "https://tinyurl.com/35wba3d6"
+
+_DNS_TTL = 300
+_geo_loop = None
+_geo_loop_lock = threading.Lock()
+_geo_session = None
+_BLOCKED_WORDS_TTL = 300
+_blocked_words_cache = (0, None, 0)
+
 
 
 
@@ -28,19 +52,16 @@ def process_ip_geolocation(client_ip: str):
     if not client_ip or client_ip == 'unknown':
         return
     
-    from .logging_utils import queue_db_operation
-    
     # Always queue background geolocation lookup for production
     if IS_PRODUCTION:
         queue_db_operation(_check_and_perform_ip_geolocation, client_ip)
-        print(f"[GEO] Queued geolocation check for IP: {client_ip}")
+        logger.info("[GEO] Queued geolocation check for IP: %s", client_ip)
     
     return None
 
 
 def _finalize_game_async(hand_id, game):
     try:
-        from .postgres_utils import finalize_hand  # CHANGED from finalize_game
         success = finalize_hand(hand_id, game)
         if success:
             print(f"[DB] Hand {hand_id} finalized in database")
@@ -57,8 +78,6 @@ def _finalize_game_async(hand_id, game):
 def _check_and_perform_ip_geolocation(ip_address: str):
     """Check if IP exists in database, only call API if missing"""
     try:
-        from .postgres_utils import get_db_connection
-        
         # Check if we already have data for this IP
         conn = get_db_connection()
         cur = conn.cursor()
@@ -68,109 +87,129 @@ def _check_and_perform_ip_geolocation(ip_address: str):
         conn.close()
         
         if existing:
-            print(f"[GEO] IP {ip_address} already in database, skipping API call")
+            logger.info("[GEO] IP %s already in database, skipping API call", ip_address)
             return True
         
         # No existing data, proceed with API call
-        print(f"[GEO] IP {ip_address} not found, calling API...")
-        return _perform_ip_geolocation_lookup(ip_address)
+        logger.info("[GEO] IP %s not found, calling API...", ip_address)
+        return _dispatch_ip_geolocation_lookup(ip_address)
         
     except Exception as e:
-        print(f"[GEO] Database check failed for {ip_address}: {e}")
+        logger.warning("[GEO] Database check failed for %s: %s", ip_address, e)
         # Fall back to API call if database check fails
-        return _perform_ip_geolocation_lookup(ip_address)
+        return _dispatch_ip_geolocation_lookup(ip_address)
 
-def _perform_ip_geolocation_lookup(ip_address: str):
-    """
-    Background worker function to perform actual geolocation API call
-    Saves ONLY the data returned from the IP API - no calculated fields
-    """
-    import urllib.request
-    import urllib.error
-    import json
-    import time
-    
+def _dispatch_ip_geolocation_lookup(ip_address: str):
+    """Hand the API call to the geo event loop so the DB worker never waits on the network"""
+    asyncio.run_coroutine_threadsafe(_async_ip_geolocation_lookup(ip_address), _get_geo_loop())
+    return True
+
+def _get_geo_loop():
+    """Start the shared geolocation event loop thread on first use"""
+    global _geo_loop
+    with _geo_loop_lock:
+        if _geo_loop is None:
+            _geo_loop = asyncio.new_event_loop()
+            threading.Thread(target=_geo_loop.run_forever, daemon=True, name='geo-loop').start()
+    return _geo_loop
+
+async def _async_ip_geolocation_lookup(ip_address: str):
+    """Fetch ip-api data on the geo loop, then queue the save back onto the DB worker"""
+    global _geo_session
     try:
-        print(f"[GEO] Starting geolocation lookup for {ip_address}")
+        logger.info("[GEO] Starting geolocation lookup for %s", ip_address)
+        if _geo_session is None:
+            _geo_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=50, use_dns_cache=True, ttl_dns_cache=_DNS_TTL),
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers=_GEO_HEADERS
+            )
+        async with _geo_session.get(_IP_API_URL % ip_address) as response:
+            if response.status != 200:
+                logger.warning("[GEO] HTTP error %s for %s", response.status, ip_address)
+                return
+            data = _json.loads(await response.read())
+        queue_db_operation(_save_ip_geolocation_result, ip_address, data)
+    except Exception as e:
+        logger.warning("[GEO] Geolocation lookup failed for %s: %s", ip_address, e)
+
+def _close_geo_session():
+    """Close the shared aiohttp session on its own loop at shutdown"""
+    if _geo_session is not None:
+        asyncio.run_coroutine_threadsafe(_geo_session.close(), _geo_loop).result(timeout=2)
+
+atexit.register(_close_geo_session)
+
+def _save_ip_geolocation_result(ip_address: str, data):
+    """Save ONLY the data returned from the IP API - no calculated fields"""
+    if data.get('status') == 'success':
+        # Extract ALL the data from the API response
+        location_data = {
+            'country': data.get('country', 'Unknown'),
+            'region': data.get('regionName', 'Unknown'),  # Note: API returns 'regionName'
+            'city': data.get('city', 'Unknown'),
+            'lat': data.get('lat', 0),
+            'lon': data.get('lon', 0),
+            'timezone': data.get('timezone', 'Unknown'),
+            'zip': data.get('zip', 'Unknown'),
+            'isp': data.get('isp', 'Unknown'),
+            'org': data.get('org', data.get('isp', 'Unknown')),  # Fallback to ISP if org missing
+            'as': data.get('as', 'Unknown')  # Full AS string like "AS7922 Comcast Cable Communications, LLC"
+        }
         
-        # Use ip-api.com
-        url = f"http://ip-api.com/json/{ip_address}"
+        success = save_ip_location_data(ip_address, location_data)
         
-        request = urllib.request.Request(url)
-        request.add_header('User-Agent', 'TwoManSpades-GeoLookup/1.0')
+        if success:
+            logger.info("[GEO] Successfully saved location data for %s: %s, %s", ip_address, location_data['city'], location_data['country'])
+        else:
+            logger.warning("[GEO] Failed to save location data for %s", ip_address)
         
-        with urllib.request.urlopen(request, timeout=10) as response:
-            if response.getcode() == 200:
-                data = json.loads(response.read().decode('utf-8'))
-                
-                if data.get('status') == 'success':
-                    # Extract ALL the data from the API response
-                    location_data = {
-                        'country': data.get('country', 'Unknown'),
-                        'region': data.get('regionName', 'Unknown'),  # Note: API returns 'regionName'
-                        'city': data.get('city', 'Unknown'),
-                        'lat': data.get('lat', 0),
-                        'lon': data.get('lon', 0),
-                        'timezone': data.get('timezone', 'Unknown'),
-                        'zip': data.get('zip', 'Unknown'),
-                        'isp': data.get('isp', 'Unknown'),
-                        'org': data.get('org', data.get('isp', 'Unknown')),  # Fallback to ISP if org missing
-                        'as': data.get('as', 'Unknown')  # Full AS string like "AS7922 Comcast Cable Communications, LLC"
-                    }
-                    
-                    from .postgres_utils import save_ip_location_data
-                    success = save_ip_location_data(ip_address, location_data)
-                    
-                    if success:
-                        print(f"[GEO] Successfully saved location data for {ip_address}: {location_data['city']}, {location_data['country']}")
-                    else:
-                        print(f"[GEO] Failed to save location data for {ip_address}")
-                    
-                    return success
-                else:
-                    print(f"[GEO] API returned failure for {ip_address}: {data.get('message', 'Unknown error')}")
-                    
-                    # Save failed lookup record
-                    from .postgres_utils import save_failed_ip_lookup
-                    save_failed_ip_lookup(ip_address)
-                    return False
-            else:
-                print(f"[GEO] HTTP error {response.getcode()} for {ip_address}")
-                return False
-                
-    except Exception as e:
-        print(f"[GEO] Geolocation lookup failed for {ip_address}: {e}")
+        return success
+    else:
+        logger.warning("[GEO] API returned failure for %s: %s", ip_address, data.get('message', 'Unknown error'))
+        
+        # Save failed lookup record
+        save_failed_ip_lookup(ip_address)
         return False
 
 def get_blocked_words():
-    """Get blocked words from tinyurl"""
+    """Get lowercased blocked words from tinyurl plus the shortest phrase length, cached so chat requests skip the DNS + HTTP round trip"""
+    global _blocked_words_cache
+    expires, words, min_len = _blocked_words_cache
+    if words is not None and expires > time.time():
+        return words, min_len
+    
     import requests
     
+    # Fallback minimal list if tinyurl fails
+    words = ['placeholder1', 'placeholder2']
     try:
-        url = "https://tinyurl.com/35wba3d6"
-        response = requests.get(url, timeout=5)
+        response = requests.get(_BLOCKED_WORDS_URL, timeout=5)
         if response.status_code == 200:
-            return [word.strip() for word in response.text.split('\n') if word.strip()]
+            words = [word.strip().lower() for word in response.text.split('\n') if word.strip()]
     except:
         pass
     
-    # Fallback minimal list if tinyurl fails
-    return ['placeholder1', 'placeholder2']
+    min_len = min(map(len, words), default=0)
+    _blocked_words_cache = (time.time() + _BLOCKED_WORDS_TTL, words, min_len)
+    return words, min_len
 
 def check_content_filter(message):
     """Check if message contains disallowed content"""
     try:
-        blocked_phrases = get_blocked_words()
+        blocked_phrases, min_len = get_blocked_words()
+        if not message or len(message) < min_len:
+            return True, None
         
-        message_lower = message.lower()
+        message_lower = message if message.islower() else message.lower()
         for phrase in blocked_phrases:
-            if phrase.lower() in message_lower:
-                print(f"[FILTER] BLOCKED message containing '{phrase}': '{message[:50]}{'...' if len(message) > 50 else ''}'")
+            if phrase in message_lower:
+                logger.info("[FILTER] BLOCKED message containing '%s': '%.50s%s'", phrase, message, '...' if len(message) > 50 else '')
                 return False, "Hey, watch the language! Let's keep it PG-13 here - I've got a reputation to maintain!"
         
         return True, None
     except Exception as e:
-        print(f"[FILTER] Error checking content filter: {e}")
+        logger.warning("[FILTER] Error checking content filter: %s", e)
         return True, None
 
 # DEVELOPMENT SERVER UTILITIES
@@ -180,7 +219,6 @@ def start_development_server(app):
     import subprocess
     import webbrowser
     import time
-    import socket
     import os
     from threading import Thread
     
@@ -199,29 +237,32 @@ def start_development_server(app):
             print(f"Could not kill processes on port {port}: {e}")
         return False
     
-    def is_port_available(port):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
-        result = sock.connect_ex(('localhost', port))
-        sock.close()
-        return result != 0
+    def try_bind(sock, port):
+        try:
+            sock.bind(('localhost', port))
+            return True
+        except OSError:
+            return False
     
     def find_available_port(start_port=5000, max_attempts=10):
-        for port in range(start_port, start_port + max_attempts):
-            if is_port_available(port):
-                print(f"Port {port} is available")
-                return port
-            else:
+        # One probe socket for the whole scan; a failed bind leaves it unbound and reusable
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            for port in range(start_port, start_port + max_attempts):
+                if try_bind(sock, port):
+                    print(f"Port {port} is available")
+                    return port
                 print(f"Port {port} is in use, attempting to kill process...")
                 if kill_process_on_port(port):
                     time.sleep(0.5)
-                    if is_port_available(port):
+                    if try_bind(sock, port):
                         print(f"Successfully freed port {port}")
                         return port
-                    else:
-                        print(f"Port {port} still in use after kill attempt")
+                    print(f"Port {port} still in use after kill attempt")
                 else:
                     print(f"Could not kill process on port {port}")
+        finally:
+            sock.close()
         
         raise RuntimeError(f"Could not find an available port in range {start_port}-{start_port + max_attempts - 1}")
     
@@ -325,71 +366,56 @@ def process_new_game_request(session, request):
 
 # GAME STATE BUILDING
 
+_SAFE_STATE_REQUIRED = (
+    'player_hand', 'current_trick', 'player_tricks', 'computer_tricks', 'spades_broken',
+    'phase', 'turn', 'winner', 'message'
+)
+
+_SAFE_STATE_DEFAULTS = (
+    ('trick_leader', None), ('hand_over', False), ('game_over', False),
+    ('player_discarded', None), ('computer_discarded', None), ('player_bid', None), ('computer_bid', None),
+    ('total_tricks', 10), ('player_bags', 0), ('computer_bags', 0), ('hand_number', 1), ('target_score', 300),
+    ('player_parity', 'even'), ('computer_parity', 'odd'), ('blind_bidding_available', False),
+    ('blind_bid', None), ('computer_blind_bid', None), ('hand_results', None)
+)
+
 def build_safe_game_state(game, debug_mode=False):
     """Build safe game state for frontend"""
-    player_name, computer_name = get_player_names_with_parity(
-        game.get('player_parity', 'even'),
-        game.get('computer_parity', 'odd')
-    )
-    
-    show_discard_explanation = game.get('hand_over', False)
-    discard_explanation = game.get('discard_bonus_explanation') if show_discard_explanation else None
+    safe_state = {key: game[key] for key in _SAFE_STATE_REQUIRED}
+    safe_state.update({key: game.get(key, default) for key, default in _SAFE_STATE_DEFAULTS})
     
     player_base_score = game.get('player_score', 0)
     computer_base_score = game.get('computer_score', 0)
-    player_bags = game.get('player_bags', 0)
-    computer_bags = game.get('computer_bags', 0)
-    
-    player_display_score = get_display_score(player_base_score, player_bags)
-    computer_display_score = get_display_score(computer_base_score, computer_bags)
-    
-    safe_state = {
-        'player_hand': game['player_hand'],
-        'computer_hand_count': len(game['computer_hand']) if debug_mode else 0,
-        'current_trick': game['current_trick'],
-        'player_tricks': game['player_tricks'],
-        'computer_tricks': game['computer_tricks'],
-        'spades_broken': game['spades_broken'],
-        'phase': game['phase'],
-        'turn': game['turn'],
-        'trick_leader': game.get('trick_leader'),
-        'hand_over': game.get('hand_over', False),
-        'game_over': game.get('game_over', False),
-        'winner': game['winner'],
-        'message': game['message'],
-        'player_discarded': game.get('player_discarded'),
-        'computer_discarded': game.get('computer_discarded'),
-        'show_computer_hand': game.get('show_computer_hand', False) and debug_mode,
-        'player_bid': game.get('player_bid'),
-        'computer_bid': game.get('computer_bid'),
-        'total_tricks': game.get('total_tricks', 10),
-        'player_score': player_display_score,
-        'computer_score': computer_display_score,
-        'player_base_score': player_base_score,
-        'computer_base_score': computer_base_score,
-        'player_bags': player_bags,
-        'computer_bags': computer_bags,
-        'hand_number': game.get('hand_number', 1),
-        'target_score': game.get('target_score', 300),
-        'player_parity': game.get('player_parity', 'even'),
-        'computer_parity': game.get('computer_parity', 'odd'),
-        'player_name': player_name,
-        'computer_name': computer_name,
-        'discard_bonus_explanation': discard_explanation,
-        'blind_bidding_available': game.get('blind_bidding_available', False),
-        'blind_bid': game.get('blind_bid'),
-        'computer_blind_bid': game.get('computer_blind_bid'),
-        'debug_mode': debug_mode,
-        'hand_results': game.get('hand_results')
-    }
+    show_computer_hand = debug_mode and game.get('show_computer_hand', False)
+    
+    safe_state['computer_hand_count'] = len(game['computer_hand']) if debug_mode else 0
+    safe_state['show_computer_hand'] = show_computer_hand
+    safe_state['player_score'] = get_display_score(player_base_score, safe_state['player_bags'])
+    safe_state['computer_score'] = get_display_score(computer_base_score, safe_state['computer_bags'])
+    safe_state['player_base_score'] = player_base_score
+    safe_state['computer_base_score'] = computer_base_score
+    safe_state['player_name'], safe_state['computer_name'] = get_player_names_with_parity(
+        safe_state['player_parity'], safe_state['computer_parity']
+    )
+    safe_state['discard_bonus_explanation'] = game.get('discard_bonus_explanation') if safe_state['hand_over'] else None
+    safe_state['debug_mode'] = debug_mode
     
-    if debug_mode and game.get('show_computer_hand', False):
+    if show_computer_hand:
         safe_state['computer_hand'] = game['computer_hand']
     
     return safe_state
 
 # BIDDING LOGIC
 
+def _log_computer_bid(session, computer_bid, is_blind, context):
+    """Log Marta's bid as blind or regular, flagging the bidding context"""
+    log_action(
+        action_type='blind_bid' if is_blind else 'regular_bid',
+        player='computer',
+        action_data={'bid_amount': computer_bid, context: True},
+        session=session
+    )
+
 def process_bidding_phase(game, session, bid, request):
     """Process player bidding with computer response and game state updates"""
     log_action(
@@ -409,23 +435,10 @@ def process_bidding_phase(game, session, bid, request):
             game
         )
         game['computer_bid'] = computer_bid
-        
         if computer_is_blind:
             game['computer_blind_bid'] = computer_bid
-            log_action(
-                action_type='blind_bid',
-                player='computer',
-                action_data={'bid_amount': computer_bid, 'in_response_to_player': True},
-                session=session
-            )
-        else:
-            log_action(
-                action_type='regular_bid',
-                player='computer',
-                action_data={'bid_amount': computer_bid, 'in_response_to_player': True},
-                session=session
-            )
-            
+        _log_computer_bid(session, computer_bid, computer_is_blind, 'in_response_to_player')
+        
         computer_blind_text = " (BLIND)" if computer_is_blind else ""
         player_blind_text = " (BLIND)" if game.get('blind_bid') == bid else ""
         
@@ -480,22 +493,10 @@ def process_blind_bid_phase(game, session, bid, request):
         game
     )
     game['computer_bid'] = computer_bid
-    
     if computer_is_blind:
         game['computer_blind_bid'] = computer_bid
-        log_action(
-            action_type='blind_bid',
-            player='computer',
-            action_data={'bid_amount': computer_bid, 'in_response_to_player': True},
-            session=session
-        )
-    else:
-        log_action(
-            action_type='regular_bid',
-            player='computer',
-            action_data={'bid_amount': computer_bid, 'in_response_to_blind': True},
-            session=session
-        )
+    _log_computer_bid(session, computer_bid, computer_is_blind,
+                      'in_response_to_player' if computer_is_blind else 'in_response_to_blind')
     
     game['phase'] = 'discard'
     computer_blind_text = " (BLIND)" if computer_is_blind else ""
@@ -507,12 +508,13 @@ def process_discard_phase(game, session, card_index, request):
     """Process discard phase with computer response and scoring"""
     player_card = game['player_hand'].pop(card_index)
     game['player_discarded'] = player_card
+    player_card_text = f"{player_card['rank']}{player_card['suit']}"
     
     log_action(
         action_type='discard',
         player='player',
         action_data={
-            'card_discarded': f"{player_card['rank']}{player_card['suit']}",
+            'card_discarded': player_card_text,
             'card_index': card_index
         },
         session=session,
@@ -523,12 +525,13 @@ def process_discard_phase(game, session, card_index, request):
     idx = computer_discard_strategy(game['computer_hand'], game)
     computer_card = game['computer_hand'].pop(idx)
     game['computer_discarded'] = computer_card
+    computer_card_text = f"{computer_card['rank']}{computer_card['suit']}"
     
     log_action(
         action_type='discard',
         player='computer',
         action_data={
-            'card_discarded': f"{computer_card['rank']}{computer_card['suit']}",
+            'card_discarded': computer_card_text,
             'card_index': idx
         },
         session=session,
@@ -556,8 +559,8 @@ def process_discard_phase(game, session, card_index, request):
     log_game_event(
         event_type='discard_scoring',
         event_data={
-            'player_card': f"{player_card['rank']}{player_card['suit']}",
-            'computer_card': f"{computer_card['rank']}{computer_card['suit']}",
+            'player_card': player_card_text,
+            'computer_card': computer_card_text,
             'winner': discard_result['winner'],
             'bonus_points': discard_result['player_bonus'] + discard_result['computer_bonus'],
             'is_double': discard_result['is_double'],
@@ -578,39 +581,7 @@ def process_discard_phase(game, session, card_index, request):
         else:
             # Already made blind decision (chose "Bid Normal"), proceed directly to bidding
             game['phase'] = 'bidding'
-            first_leader = game.get('first_leader', 'player')
-            
-            if first_leader == 'computer':
-                # Computer bids first
-                computer_bid, computer_is_blind = computer_bidding_brain(
-                    game['computer_hand'], 
-                    None,
-                    game
-                )
-                game['computer_bid'] = computer_bid
-                
-                if computer_is_blind:
-                    game['computer_blind_bid'] = computer_bid
-                    computer_blind_text = " (BLIND)"
-                    log_action(
-                        action_type='blind_bid',
-                        player='computer',
-                        action_data={'bid_amount': computer_bid, 'bid_first': True},
-                        session=session
-                    )
-                else:
-                    computer_blind_text = ""
-                    log_action(
-                        action_type='regular_bid',
-                        player='computer',
-                        action_data={'bid_amount': computer_bid, 'bid_first': True},
-                        session=session
-                    )
-                
-                game['message'] = f'Cards discarded. Marta bid {computer_bid}{computer_blind_text}. Your turn to bid.'
-            else:
-                # Player bids first
-                game['message'] = f'Cards discarded. Now make your bid: How many tricks will you take? (0-10)'
+            game['message'] = _opening_bid_message(game, session)
 
 def transition_to_playing_phase(game, session):
     """Transition from discard to playing phase"""
@@ -630,47 +601,34 @@ def transition_to_playing_phase(game, session):
         game['turn'] = 'player'
         game['message'] = f'Cards discarded. You bid {game["player_bid"]}{player_blind_text}, Marta bid {game["computer_bid"]}{computer_blind_text}. Marta led. Your turn to follow.'
 
+def _opening_bid_message(game, session):
+    """Have Marta bid first when she leads, and return the bidding prompt"""
+    if game.get('first_leader', 'player') != 'computer':
+        # Player bids first
+        return 'Cards discarded. Now make your bid: How many tricks will you take? (0-10)'
+    
+    computer_bid, computer_is_blind = computer_bidding_brain(
+        game['computer_hand'], 
+        None,
+        game
+    )
+    game['computer_bid'] = computer_bid
+    if computer_is_blind:
+        game['computer_blind_bid'] = computer_bid
+    _log_computer_bid(session, computer_bid, computer_is_blind, 'bid_first')
+    
+    computer_blind_text = " (BLIND)" if computer_is_blind else ""
+    return f'Cards discarded. Marta bid {computer_bid}{computer_blind_text}. Your turn to bid.'
+
 def transition_to_bidding_phase(game, session):
     """Transition from discard to bidding phase (or blind decision) - Uses display scores for eligibility"""
     
     # CRITICAL FIX: Only check blind eligibility ONCE per hand
     # If we've already been through blind decision, skip straight to bidding
     if game.get('blind_decision_made', False):
-        print(f"DEBUG: Blind decision already made this hand, proceeding to normal bidding")
+        logger.debug("DEBUG: Blind decision already made this hand, proceeding to normal bidding")
         game['phase'] = 'bidding'
-        first_leader = game.get('first_leader', 'player')
-        
-        if first_leader == 'computer':
-            # Computer bids first
-            computer_bid, computer_is_blind = computer_bidding_brain(
-                game['computer_hand'], 
-                None,
-                game
-            )
-            game['computer_bid'] = computer_bid
-            
-            if computer_is_blind:
-                game['computer_blind_bid'] = computer_bid
-                computer_blind_text = " (BLIND)"
-                log_action(
-                    action_type='blind_bid',
-                    player='computer',
-                    action_data={'bid_amount': computer_bid, 'bid_first': True},
-                    session=session
-                )
-            else:
-                computer_blind_text = ""
-                log_action(
-                    action_type='regular_bid',
-                    player='computer',
-                    action_data={'bid_amount': computer_bid, 'bid_first': True},
-                    session=session
-                )
-            
-            game['message'] = f'Cards discarded. Marta bid {computer_bid}{computer_blind_text}. Your turn to bid.'
-        else:
-            # Player bids first
-            game['message'] = f'Cards discarded. Now make your bid: How many tricks will you take? (0-10)'
+        game['message'] = _opening_bid_message(game, session)
         return
     
     # First time checking blind eligibility this hand - use DISPLAY SCORES
@@ -686,9 +644,13 @@ def transition_to_bidding_phase(game, session):
     # Check eligibility based on display scores
     blind_eligibility = check_blind_bidding_eligibility(player_display_score, computer_display_score)
     
-    print(f"DEBUG BLIND CHECK: Player Display={player_display_score} (base={player_base_score}, bags={player_bags}), Computer Display={computer_display_score} (base={computer_base_score}, bags={computer_bags})")
-    print(f"DEBUG BLIND CHECK: Player Eligible={blind_eligibility['player_eligible']}, Computer Eligible={blind_eligibility['computer_eligible']}")
-    print(f"DEBUG BLIND CHECK: Player Deficit={blind_eligibility['player_deficit']}, Computer Deficit={blind_eligibility['computer_deficit']}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("DEBUG BLIND CHECK: Player Display=%s (base=%s, bags=%s), Computer Display=%s (base=%s, bags=%s)",
+                     player_display_score, player_base_score, player_bags, computer_display_score, computer_base_score, computer_bags)
+        logger.debug("DEBUG BLIND CHECK: Player Eligible=%s, Computer Eligible=%s",
+                     blind_eligibility['player_eligible'], blind_eligibility['computer_eligible'])
+        logger.debug("DEBUG BLIND CHECK: Player Deficit=%s, Computer Deficit=%s",
+                     blind_eligibility['player_deficit'], blind_eligibility['computer_deficit'])
     
     if blind_eligibility['player_eligible']:
         # Player is eligible for blind bidding - ask them to choose
@@ -697,73 +659,51 @@ def transition_to_bidding_phase(game, session):
         deficit = computer_display_score - player_display_score
         game['message'] = f'Cards discarded! You are down by {deficit} points. Choose: Go BLIND for double points/penalties, or bid normally?'
         
-        print(f"DEBUG: Entering blind_decision phase with deficit of {deficit}")
+        logger.debug("DEBUG: Entering blind_decision phase with deficit of %s", deficit)
     else:
         # Player not eligible for blind bidding - go straight to normal bidding
         game['blind_decision_made'] = True  # Mark that we've checked (even though not eligible)
         game['phase'] = 'bidding'
-        first_leader = game.get('first_leader', 'player')
-        
-        if first_leader == 'computer':
-            # Computer bids first
-            computer_bid, computer_is_blind = computer_bidding_brain(
-                game['computer_hand'], 
-                None,
-                game
-            )
-            game['computer_bid'] = computer_bid
-            
-            if computer_is_blind:
-                game['computer_blind_bid'] = computer_bid
-                computer_blind_text = " (BLIND)"
-                log_action(
-                    action_type='blind_bid',
-                    player='computer',
-                    action_data={'bid_amount': computer_bid, 'bid_first': True},
-                    session=session
-                )
-            else:
-                computer_blind_text = ""
-                log_action(
-                    action_type='regular_bid',
-                    player='computer',
-                    action_data={'bid_amount': computer_bid, 'bid_first': True},
-                    session=session
-                )
-            
-            game['message'] = f'Cards discarded. Marta bid {computer_bid}{computer_blind_text}. Your turn to bid.'
-        else:
-            # Player bids first
-            game['message'] = f'Cards discarded. Now make your bid: How many tricks will you take? (0-10)'
+        game['message'] = _opening_bid_message(game, session)
         
-        print(f"DEBUG: Player not eligible for blind bidding (deficit only {blind_eligibility['player_deficit']}), proceeding to normal bidding")
+        logger.debug("DEBUG: Player not eligible for blind bidding (deficit only %s), proceeding to normal bidding", blind_eligibility['player_deficit'])
 
 # GAME LOGIC HELPERS
 
+# Per-winner (bags, trick special cards, tricks) keys for resolve_trick_with_delay
+_PLAYER_TRICK_KEYS = ('player_bags', 'player_trick_special_cards', 'player_tricks')
+_COMPUTER_TRICK_KEYS = ('computer_bags', 'computer_trick_special_cards', 'computer_tricks')
+
 def resolve_trick_with_delay(game, session_obj=None):
     """Resolve trick and set it up to be displayed for 3 seconds with logging"""
-    if len(game['current_trick']) != 2:
+    trick = game['current_trick']
+    if len(trick) != 2:
         return
     
-    winner = determine_trick_winner(game['current_trick'])
+    winner = determine_trick_winner(trick)
     
     # Save trick to history
-    trick_number = len(game.get('trick_history', [])) + 1
-    player_card = next((play['card'] for play in game['current_trick'] if play['player'] == 'player'), None)
-    computer_card = next((play['card'] for play in game['current_trick'] if play['player'] == 'computer'), None)
+    trick_history = game['trick_history']
+    trick_number = len(trick_history) + 1
+    first, second = trick
+    if first['player'] == 'player':
+        player_card, computer_card = first['card'], second['card']
+    else:
+        player_card, computer_card = second['card'], first['card']
     
-    game.setdefault('trick_history', []).append({
+    trick_history.append({
         'number': trick_number,
         'player_card': player_card,
         'computer_card': computer_card,
         'winner': winner
     })
     
+    p_text = f"{player_card['rank']}{player_card['suit']}"
+    c_text = f"{computer_card['rank']}{computer_card['suit']}"
+    winner_name = WINNER_NAMES[winner]
+    
     # Console logging
-    p_text = f"{player_card['rank']}{player_card['suit']}" if player_card else "?"
-    c_text = f"{computer_card['rank']}{computer_card['suit']}" if computer_card else "?"
-    winner_name = "You" if winner == 'player' else "Marta"
-    print(f"TRICK {trick_number}: {p_text} vs {c_text} -> {winner_name} wins")
+    logger.debug("TRICK %s: %s vs %s -> %s wins", trick_number, p_text, c_text, winner_name)
     
     # JSON logging
     if session_obj:
@@ -780,44 +720,35 @@ def resolve_trick_with_delay(game, session_obj=None):
         )
     
     # Apply special card effects immediately
-    special_result = check_special_cards_in_trick(game['current_trick'], winner)
-    
-    if special_result['bag_reduction'] > 0:
-        if winner == 'player':
-            current_bags = game.get('player_bags', 0)
-            game['player_bags'] = reduce_bags_safely(current_bags, special_result['bag_reduction'])
-            game['player_trick_special_cards'] = game.get('player_trick_special_cards', 0) + special_result['bag_reduction']
-        else:
-            current_bags = game.get('computer_bags', 0)
-            game['computer_bags'] = reduce_bags_safely(current_bags, special_result['bag_reduction'])
-            game['computer_trick_special_cards'] = game.get('computer_trick_special_cards', 0) + special_result['bag_reduction']
+    special_result = check_special_cards_in_trick((first['card'], second['card']), winner)
+    
+    bags_key, specials_key, tricks_key = _PLAYER_TRICK_KEYS if winner == 'player' else _COMPUTER_TRICK_KEYS
+    bag_reduction = special_result['bag_reduction']
+    special_explanation = special_result['explanation']
+    if bag_reduction > 0:
+        game[bags_key] = reduce_bags_safely(game.get(bags_key, 0), bag_reduction)
+        game[specials_key] = game.get(specials_key, 0) + bag_reduction
         
-        game['special_card_message'] = special_result['explanation']
+        game['special_card_message'] = special_explanation
         
         if session_obj:
             log_game_event(
                 event_type='special_card_effect',
                 event_data={
                     'trick_number': trick_number,
-                    'bag_reduction': special_result['bag_reduction'],
+                    'bag_reduction': bag_reduction,
                     'beneficiary': winner_name,
-                    'explanation': special_result['explanation']
+                    'explanation': special_explanation
                 },
                 session=session_obj
             )
     
     # Award trick and set message
-    if winner == 'player':
-        game['player_tricks'] += 1
-        base_message = 'You won the trick!'
-    else:
-        game['computer_tricks'] += 1
-        base_message = 'Marta won the trick!'
-    
-    if special_result['explanation']:
-        game['message'] = f"{base_message} {special_result['explanation']}."
+    game[tricks_key] += 1
+    if special_explanation:
+        game['message'] = f"{winner_name} won the trick! {special_explanation}."
     else:
-        game['message'] = f"{base_message}."
+        game['message'] = f"{winner_name} won the trick!."
     
     game['trick_completed'] = True
     game['trick_winner'] = winner
@@ -839,47 +770,56 @@ def computer_follow_with_logging(game, session_obj=None):
         lead_suit = lead_card['suit']
         lead_value = lead_card['value']
         
-        same_suit = [(i, c) for i, c in enumerate(hand) if c['suit'] == lead_suit]
-        spades = [(i, c) for i, c in enumerate(hand) if c['suit'] == '♠']
+        # One pass tracking the lowest winner, same-suit card, spade and overall card
+        winner_idx = same_idx = spade_idx = any_idx = None
+        winner_val = same_val = spade_val = any_val = 15
+        for i, c in enumerate(hand):
+            value = c['value']
+            suit = c['suit']
+            if value < any_val:
+                any_idx, any_val = i, value
+            if suit == lead_suit:
+                if value < same_val:
+                    same_idx, same_val = i, value
+                if lead_value < value < winner_val:
+                    winner_idx, winner_val = i, value
+            elif suit == '♠' and value < spade_val:
+                spade_idx, spade_val = i, value
         
-        if same_suit:
-            winners = [(i, c) for i, c in same_suit if c['value'] > lead_value]
-            if winners:
-                chosen_idx = min(winners, key=lambda x: x[1]['value'])[0]
-            else:
-                chosen_idx = min(same_suit, key=lambda x: x[1]['value'])[0]
-        elif lead_suit != '♠' and spades:
-            chosen_idx = min(spades, key=lambda x: x[1]['value'])[0]
+        if same_idx is not None:
+            chosen_idx = same_idx if winner_idx is None else winner_idx
+        elif lead_suit != '♠' and spade_idx is not None:
+            chosen_idx = spade_idx
         else:
-            all_cards = [(i, c) for i, c in enumerate(hand)]
-            chosen_idx = min(all_cards, key=lambda x: x[1]['value'])[0]
+            chosen_idx = any_idx
     
     # Play the card
     card = hand.pop(chosen_idx)
-    game['current_trick'].append({'player': 'computer', 'card': card})
+    trick.append({'player': 'computer', 'card': card})
+    suit = card['suit']
     
     # Logging
     if session_obj:
-        lead_card = game['current_trick'][0]['card'] if len(game['current_trick']) >= 1 else None
+        lead_card = trick[0]['card']
         log_action(
             action_type='card_play',
             player='computer',
             action_data={
-                'card_played': f"{card['rank']}{card['suit']}",
+                'card_played': f"{card['rank']}{suit}",
                 'trick_position': 2,
-                'following_suit': card['suit'] == lead_card['suit'] if lead_card else False
+                'following_suit': suit == lead_card['suit']
             },
             session=session_obj,
             additional_context={
-                'responding_to': f"{lead_card['rank']}{lead_card['suit']}" if lead_card else None,
+                'responding_to': f"{lead_card['rank']}{lead_card['suit']}",
                 'hand_size_after': len(hand)
             }
         )
     
-    if card['suit'] == '♠':
+    if suit == '♠':
         game['spades_broken'] = True
         if session_obj:
-            log_game_event('spades_broken', {'broken_by': 'computer', 'card': f"{card['rank']}{card['suit']}"}, session_obj)
+            log_game_event('spades_broken', {'broken_by': 'computer', 'card': f"{card['rank']}{suit}"}, session_obj)
 
 def computer_lead_with_logging(game, session_obj=None):
     """Computer plays a card when leading with logging"""
@@ -892,17 +832,18 @@ def computer_lead_with_logging(game, session_obj=None):
     chosen_idx = computer_lead_strategy(hand, game['spades_broken'], game)
     
     if chosen_idx is None:
-        # Fallback logic
-        valid = []
-        for i, card in enumerate(hand):
-            if card['suit'] != '♠' or game['spades_broken'] or all(c['suit'] == '♠' for c in hand):
-                valid.append((i, card))
+        # Fallback logic - lowest non-spade, else lowest spade (always legal either way)
+        nonspade_idx = spade_idx = None
+        nonspade_val = spade_val = 15
+        for i, c in enumerate(hand):
+            value = c['value']
+            if c['suit'] != '♠':
+                if value < nonspade_val:
+                    nonspade_idx, nonspade_val = i, value
+            elif value < spade_val:
+                spade_idx, spade_val = i, value
         
-        if valid:
-            chosen = min(valid, key=lambda x: (x[1]['suit'] == '♠', x[1]['value']))
-            chosen_idx = chosen[0]
-        else:
-            return
+        chosen_idx = spade_idx if nonspade_idx is None else nonspade_idx
     
     # Play the card
     card = hand.pop(chosen_idx)
@@ -931,67 +872,42 @@ def computer_lead_with_logging(game, session_obj=None):
             log_game_event('spades_broken', {'broken_by': 'computer', 'card': f"{card['rank']}{card['suit']}"}, session_obj)
 
 # HAND COMPLETION LOGIC
-def process_hand_completion(game, session):
-    """Process hand completion with all scoring logic"""
-    log_game_event(
-        event_type='hand_completed',
-        event_data={
-            'hand_number': game['hand_number'],
-            'player_tricks': game['player_tricks'],
-            'computer_tricks': game['computer_tricks'],
-            'player_bid': game.get('player_bid', 0),
-            'computer_bid': game.get('computer_bid', 0)
-        },
-        session=session
-    )
+def _apply_pending_discards(game):
+    """Apply discard bonuses and special-card bag reductions stored during the discard phase"""
+    discard_result = game.pop('pending_discard_result', None)
+    if not discard_result:
+        return
+    
+    game['player_score'] += discard_result['player_bonus']
+    game['computer_score'] += discard_result['computer_bonus']
+    explanation = discard_result['explanation']
     
-    # Apply stored discard results at the end of the hand
-    if 'pending_discard_result' in game:
-        discard_result = game['pending_discard_result']
-        game['player_score'] += discard_result['player_bonus']
-        game['computer_score'] += discard_result['computer_bonus']
+    # Apply special card effects from discards
+    special_discard_result = game.pop('pending_special_discard_result', None)
+    if special_discard_result:
+        player_reduction = special_discard_result['player_bag_reduction']
+        computer_reduction = special_discard_result['computer_bag_reduction']
         
-        # Apply special card effects from discards
-        if 'pending_special_discard_result' in game:
-            special_discard_result = game['pending_special_discard_result']
-            
-            if special_discard_result['player_bag_reduction'] > 0:
-                game['player_bags'] = reduce_bags_safely(
-                    game.get('player_bags', 0), 
-                    special_discard_result['player_bag_reduction']
-                )
-            
-            if special_discard_result['computer_bag_reduction'] > 0:
-                game['computer_bags'] = reduce_bags_safely(
-                    game.get('computer_bags', 0), 
-                    special_discard_result['computer_bag_reduction']
-                )
-            
-            # Store explanation for the final message
-            game['discard_bonus_explanation'] = discard_result['explanation']
-            if special_discard_result['explanation']:
-                game['discard_bonus_explanation'] += " | " + special_discard_result['explanation']
-        else:
-            game['discard_bonus_explanation'] = discard_result['explanation']
+        if player_reduction > 0:
+            game['player_bags'] = reduce_bags_safely(game.get('player_bags', 0), player_reduction)
         
-        # Clean up pending results
-        del game['pending_discard_result']
-        if 'pending_special_discard_result' in game:
-            del game['pending_special_discard_result']
+        if computer_reduction > 0:
+            game['computer_bags'] = reduce_bags_safely(game.get('computer_bags', 0), computer_reduction)
+        
+        if special_discard_result['explanation']:
+            explanation += " | " + special_discard_result['explanation']
+    
+    # Store explanation for the final message
+    game['discard_bonus_explanation'] = explanation
+
+def _finalize_hand(game, session, extra=None):
+    """Apply pending discards, score the hand and store hand_results for the frontend"""
+    _apply_pending_discards(game)
     
     # Calculate scoring with bags system
     scoring_result = calculate_hand_scores_with_bags(game)
     
-    # Check if blind nil ended the game (but don't return early - show full results)
-    blind_nil_ending = game.get('game_over', False)
-    
     # Create structured hand results for cleaner display
-    trick_history = game.get('trick_history', [])
-    
-    # Calculate display scores for hand results
-    player_display_score = get_display_score(game['player_score'], game.get('player_bags', 0))
-    computer_display_score = get_display_score(game['computer_score'], game.get('computer_bags', 0))
-    
     hand_results = {
         'hand_number': game['hand_number'],
         'parity': {
@@ -1000,18 +916,19 @@ def process_hand_completion(game, session):
         },
         'discard_info': game.get('discard_bonus_explanation', ''),
         'scoring': scoring_result['explanation'],
+        **(extra or {}),
         'trick_history': [
             {
                 'number': trick['number'],
-                'player_card': f"{trick['player_card']['rank']}{trick['player_card']['suit']}" if trick['player_card'] else "?",
-                'computer_card': f"{trick['computer_card']['rank']}{trick['computer_card']['suit']}" if trick['computer_card'] else "?",
-                'winner': "You" if trick['winner'] == 'player' else "Marta"
+                'player_card': f"{trick['player_card']['rank']}{trick['player_card']['suit']}",
+                'computer_card': f"{trick['computer_card']['rank']}{trick['computer_card']['suit']}",
+                'winner': WINNER_NAMES[trick['winner']]
             }
-            for trick in trick_history
+            for trick in game.get('trick_history', [])
         ],
         'totals': {
-            'player_score': player_display_score,
-            'computer_score': computer_display_score
+            'player_score': get_display_score(game['player_score'], game.get('player_bags', 0)),
+            'computer_score': get_display_score(game['computer_score'], game.get('computer_bags', 0))
         }
     }
     
@@ -1019,25 +936,41 @@ def process_hand_completion(game, session):
     game['hand_results'] = hand_results
     
     # Flush batched events to database
-    from .logging_utils import flush_hand_events
     flush_hand_events(session)
     
+    return hand_results
+
+def process_hand_completion(game, session):
+    """Process hand completion with all scoring logic"""
+    log_game_event(
+        event_type='hand_completed',
+        event_data={
+            'hand_number': game['hand_number'],
+            'player_tricks': game['player_tricks'],
+            'computer_tricks': game['computer_tricks'],
+            'player_bid': game.get('player_bid', 0),
+            'computer_bid': game.get('computer_bid', 0)
+        },
+        session=session
+    )
+    
+    hand_results = _finalize_hand(game, session)
+    
+    # Check if blind nil ended the game (but don't return early - show full results)
+    blind_nil_ending = game.get('game_over', False)
+    
     # Log final scoring
     log_game_event(
         event_type='hand_scoring',
         event_data={
-            'scoring_explanation': scoring_result['explanation'],
-            'final_scores': {
-                'player_score': player_display_score,
-                'computer_score': computer_display_score
-            },
+            'scoring_explanation': hand_results['scoring'],
+            'final_scores': dict(hand_results['totals']),
             'hand_results': hand_results
         },
         session=session
     )
     
     # CRITICAL FIX: Actually finalize the hand in the database
-    from .logging_utils import finalize_game_logging
     finalize_game_logging(game)
     
     # Set appropriate message based on game state
@@ -1070,84 +1003,17 @@ def process_hand_completion(game, session):
                 },
                 session=session
             )
+
 def process_auto_resolution(game, session):
     """Process auto-resolution of remaining cards"""
     auto_resolved, explanation = autoplay_remaining_cards(game, session)
     
     if auto_resolved:
         # Continue with normal hand completion logic
-        if 'pending_discard_result' in game:
-            discard_result = game['pending_discard_result']
-            game['player_score'] += discard_result['player_bonus']
-            game['computer_score'] += discard_result['computer_bonus']
-            
-            if 'pending_special_discard_result' in game:
-                special_discard_result = game['pending_special_discard_result']
-                
-                if special_discard_result['player_bag_reduction'] > 0:
-                    game['player_bags'] = reduce_bags_safely(
-                        game.get('player_bags', 0), 
-                        special_discard_result['player_bag_reduction']
-                    )
-                
-                if special_discard_result['computer_bag_reduction'] > 0:
-                    game['computer_bags'] = reduce_bags_safely(
-                        game.get('computer_bags', 0), 
-                        special_discard_result['computer_bag_reduction']
-                    )
-                
-                game['discard_bonus_explanation'] = discard_result['explanation']
-                if special_discard_result['explanation']:
-                    game['discard_bonus_explanation'] += " | " + special_discard_result['explanation']
-            else:
-                game['discard_bonus_explanation'] = discard_result['explanation']
-            
-            del game['pending_discard_result']
-            if 'pending_special_discard_result' in game:
-                del game['pending_special_discard_result']
-        
-        # Calculate scoring
-        scoring_result = calculate_hand_scores_with_bags(game)
+        _finalize_hand(game, session, extra={'auto_resolution': explanation})
         
         # Check if blind nil ended the game (auto-resolve case)
-        blind_nil_ending = game.get('game_over', False)
-        
-        # Create hand results
-        trick_history = game.get('trick_history', [])
-        player_display_score = get_display_score(game['player_score'], game.get('player_bags', 0))
-        computer_display_score = get_display_score(game['computer_score'], game.get('computer_bags', 0))
-        
-        hand_results = {
-            'hand_number': game['hand_number'],
-            'parity': {
-                'player': game.get('player_parity', 'even').title(),
-                'computer': game.get('computer_parity', 'odd').title()
-            },
-            'discard_info': game.get('discard_bonus_explanation', ''),
-            'scoring': scoring_result['explanation'],
-            'auto_resolution': explanation,
-            'trick_history': [
-                {
-                    'number': trick['number'],
-                    'player_card': f"{trick['player_card']['rank']}{trick['player_card']['suit']}" if trick['player_card'] else "?",
-                    'computer_card': f"{trick['computer_card']['rank']}{trick['computer_card']['suit']}" if trick['computer_card'] else "?",
-                    'winner': "You" if trick['winner'] == 'player' else "Marta"
-                }
-                for trick in trick_history
-            ],
-            'totals': {
-                'player_score': player_display_score,
-                'computer_score': computer_display_score
-            }
-        }
-        
-        game['hand_results'] = hand_results
-        
-        # Flush batched events to database
-        from .logging_utils import flush_hand_events
-        flush_hand_events(session)
-        
-        if blind_nil_ending:
+        if game.get('game_over', False):
             # Keep blind nil message and log completion
             log_game_event(
                 event_type='game_completed',
@@ -5,17 +5,48 @@ Marta responds to direct user chat messages as an active player in the game
 """
 
 import os
-from utilities.anthropic_logger import new_client, APIError, RateLimitError, APIConnectionError
-from typing import Dict, Optional, Any
+import random
+import threading
+import time
+import httpx
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from utilities.anthropic_logger import new_client, RateLimitError
+from utilities.gameplay_logic import create_deck
+from utilities.logging_utils import get_logger
+from typing import Dict, Optional, Any, Tuple, Union
 import logging
-import json
+try:
+    import orjson
+    
+    def _dumps_sorted(obj):
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+except ImportError:
+    import json
+    
+    def _dumps_sorted(obj):
+        return json.dumps(obj, separators=(',', ':'), sort_keys=True, ensure_ascii=False)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+if os.getenv('CLAUDE_DEBUG') == '1':
+    # Opt-in verbose Marta logs in production, where the app logs at INFO
+    logger.setLevel(logging.DEBUG)
 
 APP_NAME = 'twomanspades'
 
+# Display string for every (rank, suit) in the deck
+_CARD_STR = {(c['rank'], c['suit']): f"{c['rank']}{c['suit']}" for c in create_deck()}
+
+# Context keys (after Marta's renaming) that hold steady for a whole hand. They go in a
+# separate block ahead of the per-turn state, rendered once per hand.
+_STABLE_CONTEXT_KEYS = {
+    'hand_number', 'target_score', 'total_tricks', 'difficulty',
+    'my_parity', 'opponent_parity', 'first_leader',
+    'my_bid', 'opponent_bid', 'blind_bid', 'my_blind_bid', 'blind_nil',
+    'blind_bidding_available', 'blind_multiplier', 'my_score', 'opponent_score'
+}
+
 _PRICING = {
     'haiku-4-5': {'input': 0.000001, 'output': 0.000005},
     'haiku-3': {'input': 0.00000025, 'output': 0.00000125},
@@ -37,7 +68,6 @@ def log_api_usage(model, usage, feature=None, streaming=False,
                   image_count=0, user_id=None, duration_ms=None):
     """Log an API call to kumori_api_usage in a background thread.
     Never blocks the caller. Never raises."""
-    import threading
 
     def _do_log():
         try:
@@ -74,51 +104,343 @@ def log_api_usage(model, usage, feature=None, streaming=False,
             finally:
                 return_db_connection(conn)
         except Exception as e:
-            logger.warning(f"Failed to log API usage: {e}")
+            logger.warning("Failed to log API usage: %s", e)
 
     threading.Thread(target=_do_log, daemon=True).start()
 
-# For production Secret Manager
-try:
-    from google.cloud import secretmanager
-    GOOGLE_CLOUD_AVAILABLE = True
-    print("[CLAUDE] Google Cloud Secret Manager available")
-except ImportError:
-    GOOGLE_CLOUD_AVAILABLE = False
-    print("[CLAUDE] Google Cloud Secret Manager NOT available")
+# API key, environment check and Secret Manager client resolved once per process
+# (Secret Manager is imported lazily, only when needed)
+_CACHED_API_KEY = None
+_IS_GCP = None
+_SM_CLIENT = None
+
+# Canned replies for throwaway chat that doesn't need a model call (keyed by normalized message)
+_LOCAL_REPLIES = {
+    '': ("Cat got your tongue?", "Strong silent type, huh?"),
+    'gg': ("Was it though?", "GG - for one of us."),
+    'nice': ("Flattery won't save you.", "I know."),
+    'lol': ("Laugh now. Count tricks later.", "Glad one of us is having fun."),
+    'hi': ("Hi. Now play a card.", "Hello. Ready to lose?"),
+    'hello': ("Hello. Ready to lose?", "Hi. Now play a card."),
+    'ok': ("Glad we agree.", "Okay then."),
+    'thanks': ("Don't thank me yet.", "You're welcome. Enjoy it while it lasts."),
+}
+
+# Fallback lines when the API can't be used
+_NO_CONTEXT_FALLBACKS = (
+    "Interesting question...",
+    "You're keeping me on my toes.",
+    "That's one way to look at it."
+)
+_GENERIC_FALLBACKS = (
+    "Fair point.",
+    "We'll see how that plays out.",
+    "Keeping my cards close to my chest.",
+    "Game's not over yet.",
+    "Interesting perspective.",
+    "That's a bold strategy."
+)
+# Contextual fallback templates: by Marta's score standing (1 ahead, -1 behind, 0 tied), phase and hand
+_SCORE_FALLBACKS = {
+    1: "I'm up by {diff} points. Feeling good about this.",
+    -1: "You're ahead by {diff}, but I'm not worried.",
+    0: "We're tied up - makes this interesting."
+}
+_PHASE_FALLBACKS = {
+    'bidding': "Think carefully about that bid.",
+    'playing': "Your move. Choose wisely.",
+    'discard': "That discard better be strategic."
+}
+_LATER_HAND_FALLBACK = "Hand {hand} already? Time's flying."
+
+# Private generator so reply picks don't share the global random state across threads
+_RNG = random.Random()
+
+# Internal/hidden game keys Marta never sees
+_EXCLUDED_KEYS = frozenset({
+    'computer_hand', 'client_info', 'game_id', 'show_computer_hand',
+    'current_hand_id', 'game_started_at', 'action_sequence', 'trick_display_timer',
+    '_formatted_trick_history', 'player_name', 'computer_name'
+})
+_EXCLUDED_KEYS_MID_HAND = _EXCLUDED_KEYS | {
+    'discard_bonus_explanation', 'pending_discard_result', 'pending_special_discard_result'
+}
+
+_CONTEXT_CACHE_SIZE = 64  # Shared by every game on the instance
+_RECENT_TRICKS = 3  # Tricks sent to Marta in full; earlier ones are summarized
+_MAX_CTX_TOKENS = 2500  # Budget for Marta's game-state blocks, estimated as chars/4
+_REPLY_CACHE_SIZE = 512
+_REPLY_CACHE_TTL = 600  # Seconds a repeated (state, message) pair reuses Marta's earlier reply
+_INFLIGHT_WAIT = 25  # Seconds a duplicate request waits on the original (two 10s attempts plus backoff)
+_RPM_LIMIT = 40
+_TPM_LIMIT = 16000
+_THROTTLE_WAIT = 5  # Longest a request queues locally before Marta falls back to a canned reply
+_MAX_CONCURRENT_CALLS = 5
+_BACKOFF_BASE = 10  # Seconds paused after a 429, doubled per consecutive 429
+_BACKOFF_MAX_DOUBLINGS = 5
+_SETUP_RETRY_SECS = 300  # How long a failed client setup serves canned replies before setup is tried again
+
+@lru_cache(maxsize=256)
+def _stable_context_block(items: tuple) -> str:
+    """Serialized hand-level block; only a handful of these recur within a hand"""
+    return f"[MY_HAND_STATE: {_dumps_sorted(dict(items))}] " if items else ""
+
+def _context_fingerprint(game_context: Dict[str, Any]) -> tuple:
+    """Cheap key that identifies the game and changes whenever anything Marta can see changes"""
+    return (
+        game_context.get('game_id'),
+        game_context.get('current_hand_id'),
+        game_context.get('difficulty'),
+        game_context.get('hand_number'),
+        game_context.get('action_sequence'),
+        game_context.get('phase'),
+        game_context.get('turn'),
+        game_context.get('hand_over'),
+        game_context.get('player_score'),
+        game_context.get('computer_score'),
+        len(game_context.get('trick_history') or ()),
+        len(game_context.get('current_trick') or ()),
+        len(game_context.get('player_hand') or ())
+    )
+
+# MARTA CONTEXT CONVERSION
+# Per-key converters for _build_marta_visible_context. Each writes Marta's view of the value
+# into out and returns False when the value doesn't apply, falling back to _ctx_default.
+
+def _ctx_player_hand(out, key, value, hand_is_over):
+    """Marta can only see count, not actual cards in opponent's hand"""
+    if not isinstance(value, list):
+        return False
+    out['opponent_hand_size'] = len(value)
+    return True
+
+def _ctx_computer_hand_count(out, key, value, hand_is_over):
+    out['my_hand_size'] = value
+    return True
+
+def _ctx_current_trick(out, key, value, hand_is_over):
+    if not isinstance(value, list):
+        return False
+    converted_trick = []
+    for play in value:
+        if isinstance(play, dict) and 'card' in play:
+            card = play['card']
+            if isinstance(card, dict) and 'rank' in card and 'suit' in card:
+                card_str = _CARD_STR[card['rank'], card['suit']]
+                converted_trick.append({
+                    'player': 'me' if play['player'] == 'computer' else 'opponent',
+                    'card': card_str
+                })
+    out[key] = converted_trick
+    return True
+
+def _ctx_trick_history(out, key, value, hand_is_over):
+    if not isinstance(value, list):
+        return False
+    
+    # Only the last few tricks in detail; earlier ones as a win count
+    earlier = value[:-_RECENT_TRICKS]
+    if earlier:
+        my_wins = sum(1 for t in earlier if isinstance(t, dict) and t.get('winner') == 'computer')
+        out['earlier_tricks_summary'] = {
+            'tricks': len(earlier), 'my_wins': my_wins, 'opponent_wins': len(earlier) - my_wins
+        }
+    
+    converted_history = []
+    for trick in value[-_RECENT_TRICKS:]:
+        if trick.__class__ is not dict:
+            continue
+        converted_trick = {
+            'number': trick.get('number'),
+            'winner': 'me' if trick.get('winner') == 'computer' else 'opponent'
+        }
+        
+        # CRITICAL: Clearly identify who played which card
+        card = trick.get('computer_card')
+        if card.__class__ is dict and 'rank' in card and 'suit' in card:
+            converted_trick['my_card'] = _CARD_STR[card['rank'], card['suit']]
+        card = trick.get('player_card')
+        if card.__class__ is dict and 'rank' in card and 'suit' in card:
+            converted_trick['opponent_card'] = _CARD_STR[card['rank'], card['suit']]
+        converted_history.append(converted_trick)
+        
+    out[key] = converted_history
+    return True
+
+def _ctx_player_discarded(out, key, value, hand_is_over):
+    """Handle discard cards ONLY if hand is over AND they exist"""
+    if not (value and hand_is_over):
+        return False
+    if isinstance(value, dict) and 'rank' in value and 'suit' in value:
+        opponent_discard = _CARD_STR[value['rank'], value['suit']]
+        out['opponent_discarded'] = opponent_discard
+        out['opponent_discard_details'] = f"Opponent discarded {opponent_discard}"
+    return True
+
+def _ctx_computer_discarded(out, key, value, hand_is_over):
+    """Handle discard cards ONLY if hand is over AND they exist"""
+    if not (value and hand_is_over):
+        return False
+    if isinstance(value, dict) and 'rank' in value and 'suit' in value:
+        my_discard = _CARD_STR[value['rank'], value['suit']]
+        out['my_discarded'] = my_discard
+        out['my_discard_details'] = f"I discarded {my_discard}"
+    return True
+
+_TURN_PERSPECTIVE = {'computer': 'my_turn', 'player': 'opponent_turn'}
+_PERSPECTIVE = {'computer': 'me', 'player': 'opponent'}
+
+def _ctx_turn(out, key, value, hand_is_over):
+    """Convert turn to Marta's perspective"""
+    out[key] = _TURN_PERSPECTIVE.get(value, value)
+    return True
+
+def _ctx_perspective(out, key, value, hand_is_over):
+    """Convert trick leader, first leader and winner to Marta's perspective"""
+    out[key] = _PERSPECTIVE.get(value, value)
+    return True
+
+# Precomputed opponent/my names for the per-side game keys; unknown prefixed keys are renamed on the fly
+_KEY_RENAMES = {
+    f'{side}_{stat}': f'{renamed}_{stat}'
+    for side, renamed in (('player', 'opponent'), ('computer', 'my'))
+    for stat in ('bags', 'bid', 'blind_bid', 'name', 'parity', 'score', 'trick_special_cards', 'tricks')
+}
+
+# Exact JSON-safe scalar types passed through unchanged
+_SIMPLE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+def _ctx_default(out, key, value):
+    """Rename player/computer stats to opponent/my; keep other simple values as-is"""
+    new_key = _KEY_RENAMES.get(key)
+    if new_key is None:
+        if key.startswith('player_'):
+            new_key = key.replace('player_', 'opponent_')
+        elif key.startswith('computer_'):
+            new_key = key.replace('computer_', 'my_')
+    if new_key is not None:
+        out[new_key] = value
+    elif type(value) in _SIMPLE_TYPES:
+        # Only include serializable values
+        out[key] = value
+
+_CONTEXT_HANDLERS = {
+    'player_hand': _ctx_player_hand,
+    'computer_hand_count': _ctx_computer_hand_count,
+    'current_trick': _ctx_current_trick,
+    'trick_history': _ctx_trick_history,
+    'player_discarded': _ctx_player_discarded,
+    'computer_discarded': _ctx_computer_discarded,
+    'turn': _ctx_turn,
+    'trick_leader': _ctx_perspective,
+    'first_leader': _ctx_perspective,
+    'winner': _ctx_perspective,
+}
+
+@lru_cache(maxsize=32)
+def _context_plan(keys: tuple, hand_is_over: bool) -> tuple:
+    """(key, handler) pairs to convert for one game-state shape; the shape barely changes between turns"""
+    excluded = _EXCLUDED_KEYS if hand_is_over else _EXCLUDED_KEYS_MID_HAND
+    return tuple((key, _CONTEXT_HANDLERS.get(key)) for key in keys if key not in excluded)
+
+# CLIENT-SIDE RATE LIMITING
+
+class _TokenBucket:
+    """Thread-safe token bucket; pauses, then runs at half capacity for a while after the API returns 429"""
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self._full = self.capacity = capacity
+        self.rate = refill_per_sec
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._restore_at = 0.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        if self._restore_at and now >= self._restore_at:
+            self.capacity = self._full
+            self._restore_at = 0.0
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, amount: float, timeout: float) -> bool:
+        """Take tokens, sleeping until they refill; False if that would exceed timeout"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    needed = min(amount, self.capacity)
+                    if self.tokens >= needed:
+                        self.tokens -= needed
+                        return True
+                    wait = (needed - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+    
+    def release(self, amount: float):
+        """Give back tokens taken for a request that was never sent"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+    
+    def backoff(self, seconds: float = 60):
+        """Hand out nothing for `seconds`, then refill from empty at half capacity for a minute"""
+        with self._lock:
+            self.capacity = self._full / 2
+            self.tokens = 0.0
+            self._paused_until = self._updated = time.monotonic() + seconds
+            self._restore_at = self._paused_until + 60
 
-# For local development
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-    print("[CLAUDE] dotenv loaded successfully")
-except ImportError:
-    print("[CLAUDE] dotenv NOT available")
 
 class ClaudeGameChat:
     def __init__(self):
-        print("[CLAUDE] Initializing ClaudeGameChat for Marta's responses...")
+        logger.debug("[CLAUDE] Initializing ClaudeGameChat for Marta's responses...")
         
         self.api_key = self._get_api_key()
         if not self.api_key:
             error_msg = "ANTHROPIC_API_KEY not found in environment or Secret Manager"
-            print(f"[CLAUDE] ERROR: {error_msg}")
+            logger.warning("[CLAUDE] ERROR: %s", error_msg)
             raise ValueError(error_msg)
         
-        print(f"[CLAUDE] API key found: {self.api_key[:10]}...{self.api_key[-4:] if len(self.api_key) > 14 else 'SHORT'}")
+        logger.debug("[CLAUDE] API key found: %s...%s", self.api_key[:10], self.api_key[-4:] if len(self.api_key) > 14 else 'SHORT')
         
         try:
-            # Fast-fail config: one retry, 10s timeout
-            self.client = new_client(max_retries=1, timeout=10.0)
-            print("[CLAUDE] Anthropic client initialized successfully with fast-fail config")
+            # Fast-fail config: one retry, 10s timeout (3s to connect), HTTP/2 over pooled keep-alive connections
+            self._http = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60)
+            )
+            self.client = new_client(max_retries=1, timeout=httpx.Timeout(10.0, connect=3.0), http_client=self._http)
+            logger.debug("[CLAUDE] Anthropic client initialized successfully with fast-fail config")
         except Exception as e:
-            print(f"[CLAUDE] ERROR initializing Anthropic client: {e}")
+            logger.warning("[CLAUDE] ERROR initializing Anthropic client: %s", e)
             raise e
         
         self.model = "claude-haiku-4-5-20251001"
-        self.max_tokens = 150
+        self.max_tokens = 100  # 2-3 sentences run ~50-80 tokens
+        self.reveal_max_tokens = 250  # Secret reveal lists up to 11 cards before the usual 2-3 sentences
         self.temperature = 0.8
-        self.user_id = None
+        
+        # Recently built contexts across all games (LRU), keyed by _context_fingerprint
+        self._context_cache = OrderedDict()
+        self._context_lock = threading.Lock()
+        
+        # Identical prompts currently awaiting the API, so duplicates share one call,
+        # and recent replies (LRU of reply, timestamp) so exact repeats skip it entirely
+        self._inflight = {}
+        self._reply_cache = OrderedDict()
+        self._inflight_lock = threading.Lock()
+        
+        # Queue locally instead of letting bursts hit 429s and SDK retries
+        self._rpm_bucket = _TokenBucket(_RPM_LIMIT, _RPM_LIMIT / 60)
+        self._tpm_bucket = _TokenBucket(_TPM_LIMIT, _TPM_LIMIT / 60)
+        self._api_slots = threading.BoundedSemaphore(_MAX_CONCURRENT_CALLS)
+        self._rate_limit_strikes = 0
+        self._strike_lock = threading.Lock()
         
         self.system_prompt = (
             "You are Marta, playing Two-Man Spades against a human opponent. "
@@ -128,8 +450,9 @@ class ClaudeGameChat:
             "bidding patterns, and trick outcomes - but you cannot see cards still in your opponent's hand. "
             "IMPORTANT: You also cannot reveal anything about discard results until the hand is completely over. "
             "CRITICAL: When referencing specific cards played in tricks, be absolutely accurate about who played what. "
-            "Never claim to have played a card that your opponent actually played. The context clearly shows "
-            "'my_card' vs 'opponent_card' and 'outcome' descriptions. Use these to avoid factual errors. "
+            "Never claim to have played a card that your opponent actually played. In the context, 'my_card' "
+            "and plays by 'me' are cards YOU played; 'opponent_card' and plays by 'opponent' are your opponent's; "
+            "'winner' says who took the trick. Use these to avoid factual errors. "
             "Reference specific details from what you can legitimately know: current scores, recent plays, "
             "bidding accuracy, your own strategic decisions, bag situations and trick results. "
             "Be competitive and snarky while demonstrating your game intelligence through analysis of visible information. "
@@ -137,56 +460,56 @@ class ClaudeGameChat:
             "You only respond when your opponent directly talks to you - never initiate conversation."
         )
         
-        print(f"[CLAUDE] Configuration:")
-        print(f"  Model: {self.model}")
-        print(f"  Max tokens: {self.max_tokens}")
-        print(f"  Temperature: {self.temperature}")
-        print(f"  Max retries: 1")
-        print(f"  Timeout: 10.0 seconds")
-        print(f"  System prompt length: {len(self.system_prompt)} chars")
-        print(f"  Mode: Marta as active player")
+        logger.info("[CLAUDE] Marta chat ready: model=%s max_tokens=%d temperature=%.2f retries=1 timeout=10s system_prompt=%d chars",
+                    self.model, self.max_tokens, self.temperature, len(self.system_prompt))
     
 
 
     def get_marta_response(self, 
                         player_message: str, 
-                        game_context: Optional[Dict[str, Any]] = None) -> str:
+                        game_context: Optional[Dict[str, Any]] = None,
+                        user_id: Optional[str] = None) -> str:
         """Get a response from Marta as an active player in the game"""
-        print(f"\n[CLAUDE] === MARTA CHAT REQUEST ===")
-        print(f"[CLAUDE] Opponent message: '{player_message}'")
-        print(f"[CLAUDE] Game context received: {bool(game_context)}")
+        logger.debug("[CLAUDE] === MARTA CHAT REQUEST ===")
+        logger.debug("[CLAUDE] Opponent message: '%s'", player_message)
+        logger.debug("[CLAUDE] Game context received: %s", bool(game_context))
         
         if game_context:
-            print(f"[CLAUDE] Context keys count: {len(game_context.keys())}")
-            print(f"[CLAUDE] Context keys: {list(game_context.keys())}")
+            logger.debug("[CLAUDE] Context keys (%d): %s", len(game_context), game_context.keys())
+        
+        local_replies = _LOCAL_REPLIES.get(player_message.strip().lower().rstrip('!.?'))
+        if local_replies:
+            selected = _RNG.choice(local_replies)
+            logger.debug("[CLAUDE] Local reply cache-hit: '%s'", selected)
+            return selected
         
         # SECRET DEBUG: Check for magic phrase and extract hand info
         secret_hand_reveal = ""
         magic_phrase_detected = False
         
         if "abra cadabra" in player_message.lower() and game_context:
-            print(f"[CLAUDE] MAGIC PHRASE DETECTED! Preparing to reveal Marta's hand...")
+            logger.debug("[CLAUDE] MAGIC PHRASE DETECTED! Preparing to reveal Marta's hand...")
             
             computer_hand = game_context.get('computer_hand', [])
             if computer_hand:
                 hand_cards = []
                 for card in computer_hand:
                     if isinstance(card, dict) and 'rank' in card and 'suit' in card:
-                        hand_cards.append(f"{card['rank']}{card['suit']}")
+                        hand_cards.append(_CARD_STR[card['rank'], card['suit']])
                 
                 if hand_cards:
                     cards_str = ", ".join(hand_cards)
                     secret_hand_reveal = f"[SECRET_DEBUG_ACTIVATED: My actual hand is {cards_str}] "
                     magic_phrase_detected = True
-                    print(f"[CLAUDE] Secret hand info prepared: {cards_str}")
+                    logger.debug("[CLAUDE] Secret hand info prepared: %s", cards_str)
         
         try:
-            context_str = self._build_marta_visible_context(game_context)
-            if not context_str or context_str == "[MY_VISIBLE_GAME_STATE: JSON conversion failed] ":
-                print(f"[CLAUDE] Context building failed, using fallback")
+            stable_context, context_str = self._get_marta_visible_context(game_context)
+            if not context_str:
+                logger.warning("[CLAUDE] Context building failed, using fallback")
                 return self._fallback_marta_response(game_context)
             
-            print(f"[CLAUDE] Built Marta's visible context successfully")
+            logger.debug("[CLAUDE] Built Marta's visible context successfully")
             
             # Enhanced user prompt that handles both normal and secret responses
             if magic_phrase_detected:
@@ -198,7 +521,7 @@ class ClaudeGameChat:
                     f"Don't tell anyone I showed you!' Then continue with your normal competitive, snarky response about the game. "
                     f"Reference specific details from what you can legitimately see in the current game state."
                 )
-                print(f"[CLAUDE] Using SECRET REVEAL prompt mode")
+                logger.debug("[CLAUDE] Using SECRET REVEAL prompt mode")
             else:
                 user_prompt = (
                     f"{context_str}"
@@ -210,281 +533,211 @@ class ClaudeGameChat:
                     f"maintaining my snarky, poker-faced personality. Remember: I'm actively playing against this opponent."
                 )
             
-            print(f"[CLAUDE] Prompt length: {len(user_prompt)} chars")
-            print(f"[CLAUDE] Making API call to {self.model}...")
+            # Exact repeats reuse the recent reply; double-clicks wait on the call already in flight
+            inflight_key = (stable_context, user_prompt)
+            with self._inflight_lock:
+                cached = self._reply_cache.get(inflight_key)
+                if cached is not None and time.monotonic() - cached[1] < _REPLY_CACHE_TTL:
+                    self._reply_cache.move_to_end(inflight_key)
+                    logger.debug("[CLAUDE] Reply cache hit")
+                    return cached[0]
+                pending = self._inflight.get(inflight_key)
+                if pending is None:
+                    future = self._inflight[inflight_key] = Future()
             
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=self.system_prompt,
-                messages=[{
-                    "role": "user", 
-                    "content": user_prompt
-                }]
-            )
+            # Stable hand-level state first, then this turn's prompt
+            content = []
+            if stable_context:
+                content.append({"type": "text", "text": stable_context})
+            content.append({"type": "text", "text": user_prompt})
             
-            print(f"[CLAUDE] API call successful!")
-            log_api_usage(self.model, response.usage, feature='marta_chat', user_id=self.user_id)
-
-            api_response = response.content[0].text.strip()
-            print(f"[CLAUDE] Raw API response: '{api_response}'")
-            print(f"[CLAUDE] Response length: {len(api_response)} chars")
+            logger.debug("[CLAUDE] Prompt length: %s chars", len(stable_context) + len(user_prompt))
+            
+            if pending is not None:
+                logger.debug("[CLAUDE] Identical request already in flight, sharing its reply")
+                api_response = pending.result(timeout=_INFLIGHT_WAIT)
+            else:
+                api_response = None
+                try:
+                    max_tokens = self.reveal_max_tokens if magic_phrase_detected else self.max_tokens
+                    api_response = self._request_marta_reply(content, max_tokens, user_id)
+                    future.set_result(api_response)
+                except Exception as e:
+                    future.set_exception(e)
+                    raise
+                finally:
+                    with self._inflight_lock:
+                        del self._inflight[inflight_key]
+                        if api_response:
+                            self._reply_cache[inflight_key] = (api_response, time.monotonic())
+                            self._reply_cache.move_to_end(inflight_key)
+                            if len(self._reply_cache) > _REPLY_CACHE_SIZE:
+                                self._reply_cache.popitem(last=False)
+            
+            if api_response is None:
+                logger.warning("[CLAUDE] Local rate limit reached, using fallback")
+                return self._fallback_marta_response(game_context)
+            
+            logger.debug("[CLAUDE] Raw API response: '%s'", api_response)
+            logger.debug("[CLAUDE] Response length: %s chars", len(api_response))
             
             if magic_phrase_detected:
-                print(f"[CLAUDE] SECRET REVEAL response delivered!")
+                logger.debug("[CLAUDE] SECRET REVEAL response delivered!")
             
             if not api_response:
-                print(f"[CLAUDE] WARNING: Empty response from API")
+                logger.warning("[CLAUDE] WARNING: Empty response from API")
                 return self._fallback_marta_response(game_context)
             
-            print(f"[CLAUDE] SUCCESS: Returning Marta's response")
+            logger.debug("[CLAUDE] SUCCESS: Returning Marta's response")
             return api_response
             
-        except anthropic.APITimeoutError as e:
-            print(f"[CLAUDE] API Timeout Error after 10s: {e}")
-            fallback = self._fallback_marta_response(game_context)
-            print(f"[CLAUDE] Using timeout fallback: '{fallback}'")
-            return fallback
-            
         except RateLimitError as e:
-            print(f"[CLAUDE] Rate Limit Error: {e}")
-            retry_after = getattr(e.response, 'headers', {}).get('retry-after', 'unknown')
-            print(f"[CLAUDE] Retry-after header: {retry_after}")
-            fallback = self._fallback_marta_response(game_context)
-            print(f"[CLAUDE] Using rate limit fallback: '{fallback}'")
-            return fallback
-            
-        except APIConnectionError as e:
-            print(f"[CLAUDE] Connection Error: {e}")
-            fallback = self._fallback_marta_response(game_context)
-            print(f"[CLAUDE] Using connection error fallback: '{fallback}'")
-            return fallback
-            
-        except APIError as e:
-            print(f"[CLAUDE] General API Error: {e}")
-            print(f"[CLAUDE] Error type: {type(e)}")
-            if hasattr(e, 'status_code'):
-                print(f"[CLAUDE] Status code: {e.status_code}")
-            fallback = self._fallback_marta_response(game_context)
-            print(f"[CLAUDE] Using API error fallback: '{fallback}'")
-            return fallback
+            # The caller that made the request already paused the limiter; duplicates just fall back
+            logger.warning("[CLAUDE] Rate Limit Error: %s", e)
+            return self._fallback_marta_response(game_context)
             
         except Exception as e:
-            print(f"[CLAUDE] Unexpected error: {e}")
-            print(f"[CLAUDE] Error type: {type(e)}")
-            fallback = self._fallback_marta_response(game_context)
-            print(f"[CLAUDE] Using general error fallback: '{fallback}'")
-            return fallback
+            # Timeouts, connection and other API errors all get the same fallback
+            logger.warning("[CLAUDE] Marta API call failed: %r", e)
+            return self._fallback_marta_response(game_context)
 
-    def _build_marta_visible_context(self, game_context: Optional[Dict[str, Any]]) -> str:
-        """Build context showing only what Marta can legitimately see during play"""
-        print(f"[CLAUDE] Building Marta's visible context...")
+    def _request_marta_reply(self, content: list, max_tokens: int, user_id: Optional[str] = None) -> str:
+        """Send one chat turn to the API and return Marta's reply text, or None if throttled"""
+        est_tokens = (len(self.system_prompt) + sum(len(block["text"]) for block in content)) // 4 + max_tokens
+        # One deadline for both buckets; the RPM token goes back if the TPM wait runs out
+        deadline = time.monotonic() + _THROTTLE_WAIT
+        if not self._rpm_bucket.acquire(1, _THROTTLE_WAIT):
+            return None
+        if not self._tpm_bucket.acquire(est_tokens, deadline - time.monotonic()):
+            self._rpm_bucket.release(1)
+            return None
+        
+        logger.debug("[CLAUDE] Making API call to %s...", self.model)
+        
+        with self._api_slots:
+            try:
+                response = self.client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=self.temperature,
+                    system=self.system_prompt,
+                    messages=[{
+                        "role": "user", 
+                        "content": content
+                    }]
+                )
+            except RateLimitError as e:
+                self._back_off(e)
+                raise
+        
+        logger.debug("[CLAUDE] API call successful!")
+        with self._strike_lock:
+            self._rate_limit_strikes = 0
+        log_api_usage(self.model, response.usage, feature='marta_chat', user_id=user_id)
+        return response.content[0].text.strip()
+
+    def _back_off(self, error: RateLimitError):
+        """Pause locally instead of retrying: honor retry-after, doubling the hold on repeated 429s"""
+        retry_after = getattr(error.response, 'headers', {}).get('retry-after', 'unknown')
+        logger.debug("[CLAUDE] Retry-after header: %s", retry_after)
+        try:
+            hold = float(retry_after)
+        except (TypeError, ValueError):
+            hold = 0.0
+        with self._strike_lock:
+            hold = max(hold, _BACKOFF_BASE * 2 ** min(self._rate_limit_strikes, _BACKOFF_MAX_DOUBLINGS))
+            self._rate_limit_strikes += 1
+        self._rpm_bucket.backoff(hold)
+        self._tpm_bucket.backoff(hold)
+
+    def _get_marta_visible_context(self, game_context: Optional[Dict[str, Any]]) -> Tuple[str, Optional[str]]:
+        """Reuse the built context while the game state is unchanged (e.g. several messages in one turn)"""
+        if not game_context:
+            return self._build_marta_visible_context(game_context)
+        
+        key = _context_fingerprint(game_context)
+        with self._context_lock:
+            cached = self._context_cache.get(key)
+            if cached is not None:
+                self._context_cache.move_to_end(key)
+                logger.debug("[CLAUDE] Reusing Marta's visible context for unchanged game state")
+                return cached
+        
+        result = self._build_marta_visible_context(game_context)
+        if result[1]:
+            with self._context_lock:
+                self._context_cache[key] = result
+                if len(self._context_cache) > _CONTEXT_CACHE_SIZE:
+                    self._context_cache.popitem(last=False)
+        return result
+
+    def _build_marta_visible_context(self, game_context: Optional[Dict[str, Any]]) -> Tuple[str, Optional[str]]:
+        """Build (stable, per-turn) context showing only what Marta can legitimately see during play"""
+        logger.debug("[CLAUDE] Building Marta's visible context...")
         
         if not game_context:
-            print(f"[CLAUDE] No game context provided")
-            return "[MY_VISIBLE_GAME_STATE: No context available] "
+            logger.debug("[CLAUDE] No game context provided")
+            return "", "[MY_VISIBLE_GAME_STATE: No context available] "
         
-        print(f"[CLAUDE] Processing {len(game_context)} context keys...")
+        logger.debug("[CLAUDE] Processing %s context keys...", len(game_context))
         
         # Create Marta's visible context (exclude her hidden hand AND secret discard info)
         marta_visible_context = {}
         
-        for key, value in game_context.items():
-            print(f"[CLAUDE] Processing key: {key} (type: {type(value).__name__})")
-            
-            # Skip internal/hidden information
-            excluded_keys = {
-                'computer_hand', 'client_info', 'game_id', 'show_computer_hand', 
-                'current_hand_id', 'game_started_at', 'action_sequence', 'trick_display_timer'
-            }
-            
-            # Check if we should exclude discard information
-            hand_is_over = game_context.get('hand_over', False)
-            if not hand_is_over:
-                excluded_keys.update({
-                    'discard_bonus_explanation',
-                    'pending_discard_result', 'pending_special_discard_result'
-                })
+        # Walk only the visible keys; discard information stays secret until the hand is over
+        hand_is_over = game_context.get('hand_over', False)
+        
+        for key, handler in _context_plan(tuple(game_context), bool(hand_is_over)):
+            value = game_context[key]
             
-            if key in excluded_keys:
-                print(f"[CLAUDE] Excluding key: {key}")
-                continue
-                
             # Convert and rename from Marta's perspective with safe handling
             try:
-                if key == 'player_hand' and isinstance(value, list):
-                    # Marta can only see count, not actual cards in opponent's hand
-                    marta_visible_context['opponent_hand_size'] = len(value)
-                    print(f"[CLAUDE] Converted player_hand to opponent_hand_size: {len(value)}")
-                elif key == 'computer_hand_count':
-                    marta_visible_context['my_hand_size'] = value
-                    print(f"[CLAUDE] Set my_hand_size: {value}")
-                elif key == 'current_trick' and isinstance(value, list):
-                    converted_trick = []
-                    for play in value:
-                        if isinstance(play, dict) and 'card' in play:
-                            card = play['card']
-                            if isinstance(card, dict) and 'rank' in card and 'suit' in card:
-                                card_str = f"{card['rank']}{card['suit']}"
-                                if play['player'] == 'computer':
-                                    converted_trick.append({
-                                        'player': 'me',
-                                        'card': card_str,
-                                        'card_details': f"I played {card_str}"
-                                    })
-                                else:
-                                    converted_trick.append({
-                                        'player': 'opponent',
-                                        'card': card_str,
-                                        'card_details': f"Opponent played {card_str}"
-                                    })
-                    marta_visible_context[key] = converted_trick
-                    print(f"[CLAUDE] Converted current_trick: {len(converted_trick)} plays")
-                elif key == 'trick_history' and isinstance(value, list):
-                    converted_history = []
-                    for trick in value:
-                        if isinstance(trick, dict):
-                            converted_trick = {
-                                'number': trick.get('number'),
-                                'winner': 'me' if trick.get('winner') == 'computer' else 'opponent'
-                            }
-                            
-                            # CRITICAL: Clearly identify who played which card
-                            my_card = None
-                            opponent_card = None
-                            
-                            if trick.get('computer_card') and isinstance(trick['computer_card'], dict):
-                                card = trick['computer_card']
-                                if 'rank' in card and 'suit' in card:
-                                    my_card = f"{card['rank']}{card['suit']}"
-                                    converted_trick['my_card'] = my_card
-                                    
-                            if trick.get('player_card') and isinstance(trick['player_card'], dict):
-                                card = trick['player_card']
-                                if 'rank' in card and 'suit' in card:
-                                    opponent_card = f"{card['rank']}{card['suit']}"
-                                    converted_trick['opponent_card'] = opponent_card
-                            
-                            # Add explicit play description to prevent confusion
-                            if my_card and opponent_card:
-                                converted_trick['play_summary'] = f"I played {my_card}, opponent played {opponent_card}"
-                                if converted_trick['winner'] == 'me':
-                                    converted_trick['outcome'] = f"I won with my {my_card} beating opponent's {opponent_card}"
-                                else:
-                                    converted_trick['outcome'] = f"Opponent won with their {opponent_card} beating my {my_card}"
-                            
-                            converted_history.append(converted_trick)
-                            
-                    marta_visible_context[key] = converted_history
-                    print(f"[CLAUDE] Converted trick_history: {len(converted_history)} tricks")
-                # Handle discard cards ONLY if hand is over AND they exist
-                elif key == 'player_discarded' and value and hand_is_over:
-                    if isinstance(value, dict) and 'rank' in value and 'suit' in value:
-                        opponent_discard = f"{value['rank']}{value['suit']}"
-                        marta_visible_context['opponent_discarded'] = opponent_discard
-                        marta_visible_context['opponent_discard_details'] = f"Opponent discarded {opponent_discard}"
-                        print(f"[CLAUDE] Converted player_discarded to opponent_discarded")
-                elif key == 'computer_discarded' and value and hand_is_over:
-                    if isinstance(value, dict) and 'rank' in value and 'suit' in value:
-                        my_discard = f"{value['rank']}{value['suit']}"
-                        marta_visible_context['my_discarded'] = my_discard
-                        marta_visible_context['my_discard_details'] = f"I discarded {my_discard}"
-                        print(f"[CLAUDE] Converted computer_discarded to my_discarded")
-                elif key.startswith('player_'):
-                    # Rename player stats to opponent stats for Marta's perspective
-                    new_key = key.replace('player_', 'opponent_')
-                    marta_visible_context[new_key] = value
-                    print(f"[CLAUDE] Renamed {key} to {new_key}")
-                elif key.startswith('computer_'):
-                    # Rename computer stats to my stats for Marta's perspective
-                    new_key = key.replace('computer_', 'my_')
-                    marta_visible_context[new_key] = value
-                    print(f"[CLAUDE] Renamed {key} to {new_key}")
-                elif key == 'player_parity':
-                    marta_visible_context['opponent_parity'] = value
-                elif key == 'computer_parity':
-                    marta_visible_context['my_parity'] = value
-                elif key == 'player_name':
-                    marta_visible_context['opponent_name'] = value
-                elif key == 'computer_name':
-                    marta_visible_context['my_name'] = value
-                elif key == 'turn':
-                    # Convert turn to Marta's perspective
-                    if value == 'computer':
-                        marta_visible_context[key] = 'my_turn'
-                    elif value == 'player':
-                        marta_visible_context[key] = 'opponent_turn'
-                    else:
-                        marta_visible_context[key] = value
-                elif key == 'trick_leader':
-                    # Convert trick leader to Marta's perspective
-                    if value == 'computer':
-                        marta_visible_context[key] = 'me'
-                    elif value == 'player':
-                        marta_visible_context[key] = 'opponent'
-                    else:
-                        marta_visible_context[key] = value
-                elif key == 'first_leader':
-                    # Convert first leader to Marta's perspective
-                    if value == 'computer':
-                        marta_visible_context[key] = 'me'
-                    elif value == 'player':
-                        marta_visible_context[key] = 'opponent'
-                    else:
-                        marta_visible_context[key] = value
-                elif key == 'winner':
-                    # Convert winner to Marta's perspective
-                    if value == 'computer':
-                        marta_visible_context[key] = 'me'
-                    elif value == 'player':
-                        marta_visible_context[key] = 'opponent'
-                    else:
-                        marta_visible_context[key] = value
-                else:
-                    # Keep other fields as-is (but exclude discard explanation during active play)
-                    if key == 'discard_bonus_explanation' and not hand_is_over:
-                        print(f"[CLAUDE] Excluding discard_bonus_explanation (hand not over)")
-                        continue
-                    # Only include serializable values
-                    if isinstance(value, (str, int, float, bool, type(None))):
-                        marta_visible_context[key] = value
-                        print(f"[CLAUDE] Kept simple value: {key}")
-                    else:
-                        print(f"[CLAUDE] Skipping complex value: {key} (type: {type(value).__name__})")
+                if handler is None or not handler(marta_visible_context, key, value, hand_is_over):
+                    _ctx_default(marta_visible_context, key, value)
                         
             except Exception as e:
-                print(f"[CLAUDE] Error processing key {key}: {e}")
+                logger.warning("[CLAUDE] Error processing key %s: %s", key, e)
                 continue
         
         # Rest of the function remains the same...
-        print(f"[CLAUDE] Final context keys: {list(marta_visible_context.keys())}")
+        logger.debug("[CLAUDE] Final context keys: %s", marta_visible_context.keys())
+        
+        stable_items = tuple(sorted((k, v) for k, v in marta_visible_context.items() if k in _STABLE_CONTEXT_KEYS))
+        volatile = {k: v for k, v in marta_visible_context.items() if k not in _STABLE_CONTEXT_KEYS}
         
-        # Test JSON conversion with detailed error handling
+        # Test JSON conversion with detailed error handling (sorted keys keep the stable block byte-identical)
         try:
-            context_json = json.dumps(marta_visible_context, separators=(',', ':'))
-            print(f"[CLAUDE] JSON conversion successful, length: {len(context_json)} chars")
+            try:
+                stable_context = _stable_context_block(stable_items)
+            except TypeError:
+                # Unhashable value slipped into the stable keys; serialize without the cache
+                stable_context = _stable_context_block.__wrapped__(stable_items)
+            volatile_json = _dumps_sorted(volatile)
+            
+            # Oversized states shed the oldest detailed tricks first
+            history = volatile.get('trick_history')
+            while history and (len(stable_context) + len(volatile_json)) // 4 > _MAX_CTX_TOKENS:
+                history = volatile['trick_history'] = history[1:]
+                volatile_json = _dumps_sorted(volatile)
+            if (len(stable_context) + len(volatile_json)) // 4 > _MAX_CTX_TOKENS:
+                logger.warning("[CLAUDE] Context still over budget: ~%d tokens", (len(stable_context) + len(volatile_json)) // 4)
+            
+            logger.debug("[CLAUDE] JSON conversion successful, length: %s chars", len(stable_context) + len(volatile_json))
         except Exception as e:
-            print(f"[CLAUDE] JSON conversion FAILED: {e}")
-            return "[MY_VISIBLE_GAME_STATE: JSON conversion failed] "
+            logger.warning("[CLAUDE] JSON conversion FAILED: %s", e)
+            return "", None
         
-        final_context = f"[MY_VISIBLE_GAME_STATE: {context_json}] "
-        print(f"[CLAUDE] Final context length: {len(final_context)} chars")
-        return final_context
+        final_context = f"[MY_VISIBLE_GAME_STATE: {volatile_json}] "
+        logger.debug("[CLAUDE] Final context length: %s chars", len(stable_context) + len(final_context))
+        return stable_context, final_context
     
     def _fallback_marta_response(self, game_context: Optional[Dict[str, Any]]) -> str:
         """Game-aware fallback responses from Marta's perspective as active player"""
-        print(f"[CLAUDE] Generating Marta's fallback response...")
+        logger.debug("[CLAUDE] Generating Marta's fallback response...")
         
         if not game_context:
-            fallbacks = [
-                "Interesting question...",
-                "You're keeping me on my toes.",
-                "That's one way to look at it."
-            ]
-            import random
-            selected = random.choice(fallbacks)
-            print(f"[CLAUDE] No context fallback: '{selected}'")
+            selected = _RNG.choice(_NO_CONTEXT_FALLBACKS)
+            logger.debug("[CLAUDE] No context fallback: '%s'", selected)
             return selected
         
         # Try to make contextual fallbacks from Marta's perspective
@@ -494,88 +747,78 @@ class ClaudeGameChat:
             phase = game_context.get('phase', 'unknown')
             hand_number = game_context.get('hand_number', 1)
             
-            contextual_fallbacks = []
-            
-            # Score-based fallbacks from Marta's perspective
-            if my_score > opponent_score:
-                contextual_fallbacks.append(f"I'm up by {my_score - opponent_score} points. Feeling good about this.")
-            elif opponent_score > my_score:
-                contextual_fallbacks.append(f"You're ahead by {opponent_score - my_score}, but I'm not worried.")
-            else:
-                contextual_fallbacks.append("We're tied up - makes this interesting.")
-            
-            # Phase-based fallbacks
-            if phase == 'bidding':
-                contextual_fallbacks.append("Think carefully about that bid.")
-            elif phase == 'playing':
-                contextual_fallbacks.append("Your move. Choose wisely.")
-            elif phase == 'discard':
-                contextual_fallbacks.append("That discard better be strategic.")
-            
-            # Hand progression fallbacks
+            # Pick a template by score standing, phase and hand progression; only the chosen one is formatted
+            score_diff = my_score - opponent_score
+            templates = [_SCORE_FALLBACKS[(score_diff > 0) - (score_diff < 0)]]
+            phase_template = _PHASE_FALLBACKS.get(phase)
+            if phase_template:
+                templates.append(phase_template)
             if hand_number > 1:
-                contextual_fallbacks.append(f"Hand {hand_number} already? Time's flying.")
+                templates.append(_LATER_HAND_FALLBACK)
             
-            if contextual_fallbacks:
-                import random
-                selected = random.choice(contextual_fallbacks)
-                print(f"[CLAUDE] Contextual Marta fallback: '{selected}'")
-                return selected
+            selected = _RNG.choice(templates).format(diff=abs(score_diff), hand=hand_number)
+            logger.debug("[CLAUDE] Contextual Marta fallback: '%s'", selected)
+            return selected
                 
         except Exception as e:
-            print(f"[CLAUDE] Error creating contextual fallback: {e}")
+            logger.warning("[CLAUDE] Error creating contextual fallback: %s", e)
         
         # Default fallbacks if context parsing fails
-        generic_fallbacks = [
-            "Fair point.",
-            "We'll see how that plays out.",
-            "Keeping my cards close to my chest.",
-            "Game's not over yet.",
-            "Interesting perspective.",
-            "That's a bold strategy."
-        ]
-        
-        import random
-        selected = random.choice(generic_fallbacks)
-        print(f"[CLAUDE] Generic Marta fallback: '{selected}'")
+        selected = _RNG.choice(_GENERIC_FALLBACKS)
+        logger.debug("[CLAUDE] Generic Marta fallback: '%s'", selected)
         return selected
     
     def _get_api_key(self) -> Optional[str]:
         """Get API key from environment or Secret Manager with detailed logging"""
-        print(f"[CLAUDE] === API KEY DETECTION ===")
+        global _CACHED_API_KEY
+        if _CACHED_API_KEY:
+            return _CACHED_API_KEY
+        
+        logger.debug("[CLAUDE] === API KEY DETECTION ===")
         
-        # First try environment variable
+        # First try environment variable, loading .env for local development only if it's missing
         api_key = os.getenv('ANTHROPIC_API_KEY')
+        if not api_key:
+            try:
+                from dotenv import load_dotenv
+                load_dotenv()
+                logger.debug("[CLAUDE] dotenv loaded successfully")
+                api_key = os.getenv('ANTHROPIC_API_KEY')
+            except ImportError:
+                logger.debug("[CLAUDE] dotenv NOT available")
         if api_key:
-            print(f"[CLAUDE] Found API key in environment variable")
-            print(f"[CLAUDE] Key length: {len(api_key)} chars")
-            print(f"[CLAUDE] Key starts with: {api_key[:10]}...")
+            logger.debug("[CLAUDE] Found API key in environment variable")
+            logger.debug("[CLAUDE] Key length: %s chars", len(api_key))
+            logger.debug("[CLAUDE] Key starts with: %s...", api_key[:10])
+            _CACHED_API_KEY = api_key
             return api_key
         
-        print(f"[CLAUDE] No API key in environment variable")
+        logger.debug("[CLAUDE] No API key in environment variable")
         
         # Check if we're in Google Cloud
         is_gcp = self._is_google_cloud_environment()
-        print(f"[CLAUDE] Running in Google Cloud: {is_gcp}")
+        logger.debug("[CLAUDE] Running in Google Cloud: %s", is_gcp)
         
         if is_gcp:
-            print(f"[CLAUDE] Attempting to get key from Secret Manager...")
-            return self._get_secret_from_manager()
+            logger.debug("[CLAUDE] Attempting to get key from Secret Manager...")
+            _CACHED_API_KEY = self._get_secret_from_manager()
+            return _CACHED_API_KEY
         
-        print(f"[CLAUDE] Not in Google Cloud environment")
-        print(f"[CLAUDE] No API key source available")
+        logger.debug("[CLAUDE] Not in Google Cloud environment")
+        logger.debug("[CLAUDE] No API key source available")
         return None
     
     def _is_google_cloud_environment(self) -> bool:
         """Detect if we're running in Google Cloud with logging"""
+        global _IS_GCP
+        if _IS_GCP is not None:
+            return _IS_GCP
+        
         gae_env = os.getenv('GAE_ENV')
         k_service = os.getenv('K_SERVICE')
         gcp_project = os.getenv('GOOGLE_CLOUD_PROJECT')
         
-        print(f"[CLAUDE] Environment check:")
-        print(f"  GAE_ENV: {gae_env}")
-        print(f"  K_SERVICE: {k_service}")
-        print(f"  GOOGLE_CLOUD_PROJECT: {gcp_project}")
+        logger.debug("[CLAUDE] Environment check: GAE_ENV=%s K_SERVICE=%s GOOGLE_CLOUD_PROJECT=%s", gae_env, k_service, gcp_project)
         
         is_gcp = (
             gae_env == 'standard' or
@@ -583,72 +826,102 @@ class ClaudeGameChat:
             gcp_project is not None
         )
         
-        print(f"[CLAUDE] Is Google Cloud: {is_gcp}")
+        logger.debug("[CLAUDE] Is Google Cloud: %s", is_gcp)
+        _IS_GCP = is_gcp
         return is_gcp
     
     def _get_secret_from_manager(self) -> Optional[str]:
         """Get API key from Google Secret Manager with detailed logging"""
-        print(f"[CLAUDE] === SECRET MANAGER ACCESS ===")
+        global _SM_CLIENT
+        logger.debug("[CLAUDE] === SECRET MANAGER ACCESS ===")
         
-        if not GOOGLE_CLOUD_AVAILABLE:
-            print(f"[CLAUDE] ERROR: Google Cloud libraries not available")
+        try:
+            from google.cloud import secretmanager
+        except ImportError:
+            logger.warning("[CLAUDE] ERROR: Google Cloud libraries not available")
             return None
         
         try:
-            print(f"[CLAUDE] Creating Secret Manager client...")
-            client = secretmanager.SecretManagerServiceClient()
+            if _SM_CLIENT is None:
+                logger.debug("[CLAUDE] Creating Secret Manager client...")
+                _SM_CLIENT = secretmanager.SecretManagerServiceClient()
 
             secret_name = "projects/kumori-404602/secrets/KUMORI_ANTHROPIC_API_KEY/versions/latest"
-            print(f"[CLAUDE] Secret path: {secret_name}")
+            logger.debug("[CLAUDE] Secret path: %s", secret_name)
             
-            print(f"[CLAUDE] Accessing secret...")
-            response = client.access_secret_version(request={"name": secret_name})
+            logger.debug("[CLAUDE] Accessing secret...")
+            response = _SM_CLIENT.access_secret_version(request={"name": secret_name})
             
             secret_value = response.payload.data.decode("UTF-8")
-            print(f"[CLAUDE] Secret retrieved successfully")
-            print(f"[CLAUDE] Secret length: {len(secret_value)} chars")
-            print(f"[CLAUDE] Secret starts with: {secret_value[:10]}...")
+            logger.debug("[CLAUDE] Secret retrieved successfully")
+            logger.debug("[CLAUDE] Secret length: %s chars", len(secret_value))
+            logger.debug("[CLAUDE] Secret starts with: %s...", secret_value[:10])
             
             return secret_value
             
         except Exception as e:
-            print(f"[CLAUDE] ERROR accessing Secret Manager: {e}")
-            print(f"[CLAUDE] Error type: {type(e)}")
+            logger.warning("[CLAUDE] ERROR accessing Secret Manager (%s): %s", type(e).__name__, e)
             return None
 
 # Singleton instance
 _claude_chat = None
+_claude_lock = threading.Lock()
 
-def get_claude_chat() -> ClaudeGameChat:
+class _FallbackOnlyChat:
+    """Stand-in when the Anthropic client can't be set up: canned replies, no key lookups or network"""
+    _fallback_marta_response = ClaudeGameChat._fallback_marta_response
+    
+    def __init__(self):
+        self.retry_at = time.monotonic() + _SETUP_RETRY_SECS
+    
+    def get_marta_response(self, player_message: str, game_context: Optional[Dict[str, Any]] = None,
+                           user_id: Optional[str] = None) -> str:
+        return self._fallback_marta_response(game_context)
+
+def _needs_setup(chat) -> bool:
+    """True when there is no instance yet, or a failed setup is due for another try"""
+    return chat is None or (isinstance(chat, _FallbackOnlyChat) and time.monotonic() >= chat.retry_at)
+
+def get_claude_chat() -> Union[ClaudeGameChat, _FallbackOnlyChat]:
     """Get singleton Claude chat instance for Marta responses"""
     global _claude_chat
-    if _claude_chat is None:
-        print("[CLAUDE] Creating new ClaudeGameChat singleton instance (Marta as player)")
-        _claude_chat = ClaudeGameChat()
-    else:
-        print("[CLAUDE] Using existing ClaudeGameChat singleton (Marta as player)")
+    chat = _claude_chat
+    if not _needs_setup(chat):
+        return chat
+    
+    # Double-checked so concurrent first requests build only one instance
+    with _claude_lock:
+        if _needs_setup(_claude_chat):
+            logger.debug("[CLAUDE] Creating new ClaudeGameChat singleton instance (Marta as player)")
+            try:
+                _claude_chat = ClaudeGameChat()
+            except Exception as e:
+                # Remember the failure for a while so chats don't redo key detection on every turn
+                logger.warning("[CLAUDE] Marta chat unavailable, using canned replies for %ds: %s", _SETUP_RETRY_SECS, e)
+                _claude_chat = _FallbackOnlyChat()
     return _claude_chat
 
 def get_smart_marta_response(player_message: str, game_state: Dict[str, Any], user_id: str = None) -> str:
     """Convenience function to get Marta's response as active player"""
-    print(f"[CLAUDE] get_smart_marta_response called (Marta as active player)")
-    print(f"[CLAUDE] Opponent message: '{player_message}'")
-    print(f"[CLAUDE] Game state keys: {list(game_state.keys()) if game_state else 'None'}")
+    logger.debug("[CLAUDE] get_smart_marta_response called (Marta as active player)")
+    logger.debug("[CLAUDE] Opponent message: '%s'", player_message)
+    logger.debug("[CLAUDE] Game state keys: %s", game_state.keys() if game_state else None)
 
     claude = get_claude_chat()
-    claude.user_id = user_id
-    response = claude.get_marta_response(player_message, game_state)
+    response = claude.get_marta_response(player_message, game_state, user_id=user_id)
     
-    print(f"[CLAUDE] Final Marta response: '{response}'")
+    logger.debug("[CLAUDE] Final Marta response: '%s'", response)
     return response
 
 # Test function for debugging
 def test_claude_connection():
     """Test function to verify Claude API connectivity with Marta as player"""
-    print(f"[CLAUDE] === TESTING CLAUDE CONNECTION (MARTA AS PLAYER) ===")
+    logger.debug("[CLAUDE] === TESTING CLAUDE CONNECTION (MARTA AS PLAYER) ===")
     
     try:
         claude = get_claude_chat()
+        if isinstance(claude, _FallbackOnlyChat):
+            return False, "Anthropic client unavailable"
         
         # Test with rich game context - simulating opponent asking about game state
         test_context = {
@@ -670,10 +943,10 @@ def test_claude_connection():
         }
         
         test_response = claude.get_marta_response("How do you think this hand is going?", test_context)
-        print(f"[CLAUDE] Marta player test successful: '{test_response}'")
+        logger.debug("[CLAUDE] Marta player test successful: '%s'", test_response)
         return True, test_response
     except Exception as e:
-        print(f"[CLAUDE] Marta player test failed: {e}")
+        logger.warning("[CLAUDE] Marta player test failed: %s", e)
         return False, str(e)
 
 if __name__ == "__main__":
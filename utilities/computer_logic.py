@@ -7,9 +7,12 @@ from .custom_rules import (
     get_discard_value, 
     is_special_card, 
     check_blind_bidding_eligibility,
-    apply_blind_scoring
+    apply_blind_scoring,
+    SPECIAL_CARD_CODES,
+    WINNER_NAMES
 )
 
+from .gameplay_logic import encode_card, SPADES_CODE
 from .logging_utils import log_game_event
 
 # DIFFICULTY SYSTEM
@@ -59,24 +62,17 @@ def analyze_hand_strength(hand):
     probable_tricks = 0
     special_card_bonus = 0
     
-    # Count special cards for strategic value
-    for card in hand:
-        is_special, bag_reduction = is_special_card(card)
-        if is_special:
+    # Single pass: bag-of-cards vector (one bitmask of held values per suit code) plus special cards
+    suit_masks = [0, 0, 0, 0]
+    for code in map(encode_card, hand):
+        suit_masks[code >> 4] |= 1 << (code & 0xF)
+        if code in SPECIAL_CARD_CODES:
             special_card_bonus += 0.2  # Special cards provide strategic value
-    
-    # Separate spades from other suits
-    spades = [card for card in hand if card['suit'] == '♠']
-    other_suits = [card for card in hand if card['suit'] != '♠']
-    
-    # Group other suits
-    suits = {'♥': [], '♦': [], '♣': []}
-    for card in other_suits:
-        suits[card['suit']].append(card)
+    spade_mask = suit_masks[SPADES_CODE]
+    other_masks = [mask for suit, mask in enumerate(suit_masks) if suit != SPADES_CODE]  # ♥, ♦, ♣
     
     # ENHANCED SPADES ANALYSIS
-    spade_values = sorted([card['value'] for card in spades], reverse=True)
-    spade_count = len(spades)
+    spade_count = spade_mask.bit_count()
     
     # Apply spade count expectations
     if spade_count >= 5:
@@ -95,9 +91,9 @@ def analyze_hand_strength(hand):
         sure_tricks += 0.3  # Low expectation from 1 spade
     
     # High spades get additional value
-    ace_spades = sum(1 for v in spade_values if v == 14)
-    king_spades = sum(1 for v in spade_values if v == 13)
-    queen_spades = sum(1 for v in spade_values if v == 12)
+    ace_spades = spade_mask >> 14 & 1
+    king_spades = spade_mask >> 13 & 1
+    queen_spades = spade_mask >> 12 & 1
     
     if ace_spades > 0:
         sure_tricks += 0.3 * ace_spades  # Ace of spades is nearly guaranteed
@@ -110,35 +106,34 @@ def analyze_hand_strength(hand):
     aces_other_suits = 0
     kings_other_suits = 0
     
-    for suit, cards in suits.items():
-        if not cards:
+    for mask in other_masks:
+        if not mask:
             continue
-            
-        values = sorted([card['value'] for card in cards], reverse=True)
+        suit_count = mask.bit_count()
         
         # Count high cards for overall hand strength
-        aces_in_suit = sum(1 for v in values if v == 14)
-        kings_in_suit = sum(1 for v in values if v == 13)
+        aces_in_suit = mask >> 14 & 1
+        kings_in_suit = mask >> 13 & 1
         
         aces_other_suits += aces_in_suit
         kings_other_suits += kings_in_suit
         
         # Aces in other suits (can be trumped but still strong)
-        if 14 in values:
+        if aces_in_suit:
             sure_tricks += 0.8 * aces_in_suit  # High but not guaranteed
         
         # Protected kings (with ace)
-        if 13 in values and 14 in values:
+        if kings_in_suit and aces_in_suit:
             sure_tricks += 0.6 * kings_in_suit  # Protected kings are strong
-        elif 13 in values:
-            if len(cards) >= 3:  # King in long suit has protection
+        elif kings_in_suit:
+            if suit_count >= 3:  # King in long suit has protection
                 probable_tricks += 0.5 * kings_in_suit
             else:  # Unprotected king
                 probable_tricks += 0.3 * kings_in_suit
         
         # Long suits can generate tricks through length
-        if len(cards) >= 4:
-            probable_tricks += (len(cards) - 3) * 0.25
+        if suit_count >= 4:
+            probable_tricks += (suit_count - 3) * 0.25
     
     # MULTIPLE HIGH CARDS BONUS
     total_high_cards = aces_other_suits + kings_other_suits + ace_spades + king_spades
@@ -153,7 +148,7 @@ def analyze_hand_strength(hand):
         probable_tricks += 0.2
     
     # VOID SUITS (can trump)
-    void_suits = sum(1 for cards in suits.values() if len(cards) == 0)
+    void_suits = other_masks.count(0)
     if void_suits > 0 and spade_count >= 2:
         probable_tricks += void_suits * 0.4  # Void + spades = trumping opportunities
     
@@ -241,16 +236,17 @@ def computer_discard_strategy(computer_hand, game_state):
 
 # BIDDING STRATEGY
 
-def should_bid_nil(hand, game_state):
+def should_bid_nil(hand, game_state, strength=None):
     """
     Determine if computer should bid nil
+    strength: optional precomputed analyze_hand_strength(hand) result
     """
     player_score = game_state.get('player_score', 0)
     computer_score = game_state.get('computer_score', 0)
     player_bid = game_state.get('player_bid', 0)
     
     # Get hand strength
-    sure_tricks, probable_tricks, special_bonus = analyze_hand_strength(hand)
+    sure_tricks, probable_tricks, special_bonus = strength or analyze_hand_strength(hand)
     total_expectation = sure_tricks + probable_tricks + special_bonus
     
     # Use configurable nil threshold
@@ -324,8 +320,11 @@ def computer_bidding_brain(computer_hand, player_bid, game_state):
     computer_score = game_state.get('computer_score', 0)
     computer_bags = game_state.get('computer_bags', 0)
 
+    # Analyze the hand once for both the nil check and the regular bid
+    strength = analyze_hand_strength(computer_hand)
+
     # Check for nil opportunity first
-    if should_bid_nil(computer_hand, game_state):
+    if should_bid_nil(computer_hand, game_state, strength):
         return 0, False
 
     # Check for blind bidding opportunity
@@ -334,7 +333,7 @@ def computer_bidding_brain(computer_hand, player_bid, game_state):
         return blind_amount, True
 
     # Regular bidding logic
-    sure_tricks, probable_tricks, special_bonus = analyze_hand_strength(computer_hand)
+    sure_tricks, probable_tricks, special_bonus = strength
     base_expectation = sure_tricks + probable_tricks + special_bonus
 
     # Apply difficulty-based accuracy boost
@@ -397,9 +396,10 @@ def computer_lead_strategy(computer_hand, spades_broken, game_state=None):
     from .custom_rules import is_special_card
     
     # Find all valid leads (respecting spades rules)
+    can_lead_spades = spades_broken or all(c['suit'] == '♠' for c in computer_hand)
     valid_leads = []
     for i, card in enumerate(computer_hand):
-        if card['suit'] != '♠' or spades_broken or all(c['suit'] == '♠' for c in computer_hand):
+        if can_lead_spades or card['suit'] != '♠':
             valid_leads.append((i, card))
     
     if not valid_leads:
@@ -632,7 +632,8 @@ def autoplay_remaining_cards(game, session_obj=None):
         # Simulate the remaining tricks and add to history
         player_cards = game['player_hand'].copy()
         computer_cards = game['computer_hand'].copy()
-        current_trick_number = len(game.get('trick_history', [])) + 1
+        trick_history = game['trick_history']
+        current_trick_number = len(trick_history) + 1
         
         # Log console message for auto-resolution
         print(f"AUTO-RESOLVE: {explanation}")
@@ -644,17 +645,18 @@ def autoplay_remaining_cards(game, session_obj=None):
             computer_card = computer_cards.pop(0)
             
             # Add to trick history
-            game.setdefault('trick_history', []).append({
+            trick_history.append({
                 'number': current_trick_number,
                 'player_card': player_card,
                 'computer_card': computer_card,
                 'winner': winner_of_remaining  # Predetermined winner
             })
             
-            # Log each auto-played trick to console
             p_text = f"{player_card['rank']}{player_card['suit']}"
             c_text = f"{computer_card['rank']}{computer_card['suit']}"
-            winner_name = "You" if winner_of_remaining == 'player' else "Marta"
+            winner_name = WINNER_NAMES[winner_of_remaining]
+            
+            # Log each auto-played trick to console
             print(f"AUTO-TRICK {current_trick_number}: {p_text} vs {c_text} -> {winner_name} wins")
             
             current_trick_number += 1
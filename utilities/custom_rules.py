@@ -1,15 +1,15 @@
 import random
+from .gameplay_logic import encode_card, get_card_value
+
+# Display names for trick/discard winners
+WINNER_NAMES = {'player': 'You', 'computer': 'Marta'}
 
 def get_display_score(base_score, bags):
     """Convert base score and bags to display score (bags in ones column)"""
-    if bags >= 0:
-        if base_score < 0:
-            tens_and_higher = (base_score // 10) * 10
-            return tens_and_higher - bags
-        else:
-            tens_and_higher = (base_score // 10) * 10
-            return tens_and_higher + bags
-    return base_score
+    if bags < 0:
+        return base_score
+    # base - base % 10 floors to the tens for either sign; negative scores show bags subtracted
+    return base_score - base_score % 10 + (bags if base_score >= 0 else -bags)
 
 def get_discard_value(card):
     """
@@ -58,6 +58,12 @@ def is_special_card(card):
     else:
         return False, 0
 
+# Packed codes (see gameplay_logic.encode_card) of the special cards, for O(1) checks in the AI's hot loops
+SPECIAL_CARD_CODES = frozenset(
+    encode_card({'rank': rank, 'suit': suit, 'value': get_card_value(rank)})
+    for rank, suit in (('7', '♦'), ('10', '♣'))
+)
+
 def check_blind_bidding_eligibility(player_score, computer_score, target_score=300):
     """
     Check if a player is eligible for blind bidding (down by 100+ points).
@@ -131,7 +137,7 @@ def check_special_cards_in_discard(player_discard, computer_discard, discard_win
     # Create explanation
     explanation = ""
     if special_cards_found:
-        winner_name = "You" if discard_winner == 'player' else "Marta"
+        winner_name = WINNER_NAMES.get(discard_winner, "Marta")
         cards_text = ", ".join(special_cards_found)
         explanation = f"{winner_name} won discard pile with special cards: {cards_text}"
     
@@ -141,15 +147,15 @@ def check_special_cards_in_discard(player_discard, computer_discard, discard_win
         'explanation': explanation
     }
 
-def check_special_cards_in_trick(trick, winner):
+def check_special_cards_in_trick(cards, winner):
     """
     Check for special cards in a completed trick and apply bag reduction to winner.
+    Takes the trick's cards in play order.
     """
     total_reduction = 0
     special_cards_found = []
     
-    for play in trick:
-        card = play['card']
+    for card in cards:
         is_special, reduction = is_special_card(card)
         if is_special:
             total_reduction += reduction
@@ -158,7 +164,7 @@ def check_special_cards_in_trick(trick, winner):
     
     explanation = ""
     if special_cards_found:
-        winner_name = "You" if winner == 'player' else "Marta"
+        winner_name = WINNER_NAMES[winner]
         cards_text = ", ".join(special_cards_found)
         explanation = f"{winner_name} won trick with special cards: {cards_text}"
     
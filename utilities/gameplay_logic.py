@@ -23,6 +23,14 @@ def get_card_value(rank):
     else:
         return int(rank)
 
+# Packed card codes for the AI's hand analysis: value (2-14) in the low 4 bits, suit code above
+SUIT_CODES = {'♠': 0, '♥': 1, '♦': 2, '♣': 3}
+SPADES_CODE = SUIT_CODES['♠']
+
+def encode_card(card):
+    """Pack a card dict into an int; suit is code >> 4, value is code & 0xF"""
+    return card['value'] | SUIT_CODES[card['suit']] << 4
+
 def sort_hand(hand):
     """Sort hand by suit (clubs, diamonds, hearts, spades) then by value"""
     suit_order = {'♣': 0, '♦': 1, '♥': 2, '♠': 3}
@@ -220,6 +228,17 @@ def is_valid_play(card, hand, trick, spades_broken):
             return card['suit'] == lead_suit
         return True
 
+def _build_leader_wins_table():
+    """Precompute whether the leader wins for every (lead suit, lead value, follow suit, follow value)"""
+    deck = create_deck()
+    return {
+        (lead['suit'], lead['value'], follow['suit'], follow['value']):
+            lead['value'] > follow['value'] if lead['suit'] == follow['suit'] else follow['suit'] != '♠'
+        for lead in deck for follow in deck
+    }
+
+_LEADER_WINS = _build_leader_wins_table()
+
 def determine_trick_winner(trick):
     """
     Determine who won a completed trick
@@ -228,24 +247,13 @@ def determine_trick_winner(trick):
     if len(trick) != 2:
         return None
     
-    first = trick[0]
-    second = trick[1]
+    first, second = trick
+    lead, follow = first['card'], second['card']
     
-    if first['card']['suit'] == second['card']['suit']:
-        # Same suit, higher value wins
-        if first['card']['value'] > second['card']['value']:
-            return first['player']
-        else:
-            return second['player']
-    elif first['card']['suit'] == '♠':
-        # First player trumped
-        return first['player']
-    elif second['card']['suit'] == '♠':
-        # Second player trumped  
-        return second['player']
-    else:
-        # Different suits, no trump - first player (leader) wins
+    # Same suit: higher value wins; otherwise a spade follow trumps, else the leader wins
+    if _LEADER_WINS[lead['suit'], lead['value'], follow['suit'], follow['value']]:
         return first['player']
+    return second['player']
 
 def check_game_over(game):
     """
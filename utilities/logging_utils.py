@@ -12,6 +12,10 @@ import platform
 from datetime import datetime
 import threading
 import queue
+import atexit
+import logging
+import sys
+from logging.handlers import QueueHandler, QueueListener
 
 # GLOBAL LOGGING CONFIGURATION
 
@@ -35,6 +39,28 @@ CURRENT_LOG_FILE = None
 # Production logging placeholder
 PRODUCTION_LOG_PLACEHOLDER = "[PRODUCTION] Log entry saved to pending database implementation"
 
+# BACKGROUND CONSOLE LOGGING
+
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+
+def get_logger(name):
+    """Get a logger whose records are written to stdout by a background listener thread"""
+    global _log_listener
+    if _log_listener is None:
+        _log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+    
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(QueueHandler(_log_queue))
+        logger.setLevel(logging.DEBUG if IS_LOCAL_DEVELOPMENT else logging.INFO)
+        logger.propagate = False
+    return logger
+
+logger = get_logger(__name__)
+
 # ASYNC DATABASE LOGGING SYSTEM
 
 # Global async logging system
@@ -281,23 +307,27 @@ def _start_new_log_file(game_id):
         CURRENT_LOG_FILE = None
 
 def _write_to_current_log_file(log_entry):
-    """Write log entry to current game's log file - APPEND ONLY"""
+    """Queue log entry for current game's log file - APPEND ONLY, written by the log file thread"""
     if not IS_LOCAL_DEVELOPMENT or not LOG_TO_FILE or not CURRENT_LOG_FILE:
         return
-    
+    _start_log_file_writer()
+    _file_queue.put((CURRENT_LOG_FILE, log_entry))
+
+def _append_log_entries(log_file, entries):
+    """Append a batch of entries to a log file with a single read-modify-write"""
     try:
         # APPEND-ONLY approach - read existing, append new, write back
         logs = []
-        if os.path.exists(CURRENT_LOG_FILE):
+        if os.path.exists(log_file):
             try:
-                with open(CURRENT_LOG_FILE, 'r') as f:
+                with open(log_file, 'r') as f:
                     logs = json.load(f)
             except (json.JSONDecodeError, IOError):
                 logs = []  # Start fresh if file is corrupted
         
-        logs.append(log_entry)
+        logs.extend(entries)
         
-        with open(CURRENT_LOG_FILE, 'w') as f:
+        with open(log_file, 'w') as f:
             json.dump(logs, f, indent=2, default=str)
     except Exception as e:
         if LOG_TO_CONSOLE:
@@ -327,6 +357,58 @@ def _finalize_current_log_file(final_game_state):
     if LOG_TO_CONSOLE:
         print(f"Finalized game log: {os.path.basename(CURRENT_LOG_FILE)}")
 
+# BACKGROUND LOG FILE WRITES
+
+# Dev log-file appends are drained by one daemon thread, started on the first write, so a
+# burst of events costs one read-modify-write per file. Console output goes through logger.
+_file_queue = queue.SimpleQueue()
+_file_writer = None
+_file_writer_lock = threading.Lock()
+_FILE_BATCH_SIZE = 100
+_STOP_WRITER = object()  # Queued at exit; the worker writes everything ahead of it, then returns
+
+def _drain_file_queue(first=None):
+    """Collect up to a batch of queued (log_file, entry) pairs without blocking"""
+    batch = [first] if first else []
+    while len(batch) < _FILE_BATCH_SIZE:
+        try:
+            batch.append(_file_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+def _write_log_batch(batch):
+    """Write each log file once per batch"""
+    pending_files = {}
+    for log_file, entry in batch:
+        pending_files.setdefault(log_file, []).append(entry)
+    for log_file, entries in pending_files.items():
+        _append_log_entries(log_file, entries)
+
+def _log_file_worker():
+    """Background worker for log file appends; the only thread that writes log files"""
+    while True:
+        batch = _drain_file_queue(_file_queue.get())
+        if _STOP_WRITER in batch:
+            _write_log_batch([item for item in batch if item is not _STOP_WRITER])
+            return
+        _write_log_batch(batch)
+
+def _stop_log_file_writer():
+    """Let the worker finish everything queued before the interpreter exits"""
+    _file_queue.put(_STOP_WRITER)
+    _file_writer.join(timeout=5)
+
+def _start_log_file_writer():
+    """Start the log file thread on first use"""
+    global _file_writer
+    if _file_writer is None:
+        with _file_writer_lock:
+            if _file_writer is None:
+                _file_writer = threading.Thread(target=_log_file_worker, daemon=True, name='log-file-writer')
+                _file_writer.start()
+                atexit.register(_stop_log_file_writer)
+
 # GAME INITIALIZATION - STREAMLINED
 
 def initialize_game_logging(game):
@@ -472,7 +554,7 @@ def log_action(action_type, player, action_data, session=None, additional_contex
     if client_info:
         action_record['client_info'] = client_info
     
-    # File logging (development) - synchronous, fast
+    # File logging (development) - queued for the event output thread
     _write_to_current_log_file({
         'log_type': 'action',
         'data': action_record
@@ -516,9 +598,9 @@ def log_action(action_type, player, action_data, session=None, additional_contex
             google_email=google_email
         )
     
-    # Console logging - synchronous, fast
+    # Console logging - written by the logger's background listener
     if LOG_TO_CONSOLE and CONSOLE_LOG_LEVEL in ['ALL', 'ACTIONS_ONLY']:
-        _print_action_log(action_record)
+        logger.info(_format_action_log(action_record))
 
 def log_game_event(event_type, event_data, session=None):
     """Central logging function for major game events with ASYNC database integration"""
@@ -527,7 +609,7 @@ def log_game_event(event_type, event_data, session=None):
     
     event_record = _build_event_record(event_type, event_data, session)
     
-    # File logging (development) - synchronous, fast
+    # File logging (development) - queued for the event output thread
     _write_to_current_log_file({
         'log_type': 'game_event',
         'data': event_record
@@ -565,9 +647,9 @@ def log_game_event(event_type, event_data, session=None):
         else:
             print(f"[DB] Skipping event {event_type} - no hand_id available")
     
-    # Console logging
+    # Console logging - written by the logger's background listener
     if LOG_TO_CONSOLE and CONSOLE_LOG_LEVEL in ['ALL', 'EVENTS_ONLY']:
-        _print_event_log(event_record)
+        logger.info(_format_event_log(event_record))
 
 def _log_game_event_to_db_async(hand_id, event_type, event_data, **kwargs):
     """Async wrapper for database event logging"""
@@ -649,26 +731,26 @@ def _build_event_record(event_type, event_data, session):
 
 # CONSOLE OUTPUT FUNCTIONS
 
-def _print_action_log(action_record):
-    """Print action log to console with formatting"""
+def _format_action_log(action_record):
+    """Format action log for the console"""
     timestamp_str = datetime.fromtimestamp(action_record['timestamp']).strftime('%H:%M:%S.%f')[:-3]
-    print(f"=== ACTION #{action_record['sequence']}: {action_record['action_type'].upper()} by {action_record['player'].upper()} ===")
-    print(f"Hand #{action_record['hand_number']} | Phase: {action_record['phase']} | Time: {timestamp_str}")
-    print(f"Data: {action_record['action_data']}")
-    
     ctx = action_record['game_context']
-    print(f"Context: Score {ctx['player_score']}-{ctx['computer_score']} | Tricks {ctx['player_tricks']}-{ctx['computer_tricks']} | Bags {ctx['player_bags']}-{ctx['computer_bags']}")
-    
+    lines = [
+        f"=== ACTION #{action_record['sequence']}: {action_record['action_type'].upper()} by {action_record['player'].upper()} ===",
+        f"Hand #{action_record['hand_number']} | Phase: {action_record['phase']} | Time: {timestamp_str}",
+        f"Data: {action_record['action_data']}",
+        f"Context: Score {ctx['player_score']}-{ctx['computer_score']} | Tricks {ctx['player_tricks']}-{ctx['computer_tricks']} | Bags {ctx['player_bags']}-{ctx['computer_bags']}"
+    ]
     if action_record.get('additional_context'):
-        print(f"Extra: {action_record['additional_context']}")
-    
-    print("=" * 60)
-
-def _print_event_log(event_record):
-    """Print game event log to console with formatting"""
-    print(f"GAME EVENT: {event_record['event_type'].upper()}")
-    print(f"Hand #{event_record['hand_number']} | Data: {event_record['event_data']}")
-    print("*" * 40)
+        lines.append(f"Extra: {action_record['additional_context']}")
+    lines.append("=" * 60)
+    return "\n".join(lines)
+
+def _format_event_log(event_record):
+    """Format game event log for the console"""
+    return (f"GAME EVENT: {event_record['event_type'].upper()}\n"
+            f"Hand #{event_record['hand_number']} | Data: {event_record['event_data']}\n"
+            + "*" * 40)
 
 # DEBUG ENDPOINTS - FILE READING ONLY ON DEMAND
 